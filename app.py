@@ -1,16 +1,39 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, render_template, request, jsonify, redirect, url_for, Response, stream_with_context, send_from_directory, g, abort, has_app_context
+from werkzeug.utils import safe_join
 import sqlite3
 import re
 import secrets
 import string
 import requests
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 import os
+import sys
 import base64
 import hashlib
+import math
 import time
+import queue
+import threading
+import asyncio
+import httpx
+import csv
+import click
+from concurrent.futures import ProcessPoolExecutor
+from eth_utils import keccak
+from functools import wraps
+import io
+import gzip
+import zlib
+import shutil
+import mimetypes
+import logging
+import logging.handlers
+import contextvars
+import atexit
+import fcntl
+from collections import deque, OrderedDict
 
 # Load environment variables
 load_dotenv()
@@ -24,6 +47,9 @@ TWITTER_API_KEY = os.getenv('TWITTER_API_KEY')
 TWITTER_API_SECRET = os.getenv('TWITTER_API_SECRET')
 TWITTER_USERNAME = os.getenv('TWITTER_USERNAME', '').replace('@', '').strip()
 
+# Admin endpoints (exports etc.) require this token; they stay disabled without it
+ADMIN_API_TOKEN = os.getenv('ADMIN_API_TOKEN')
+
 # Token distribution configuration
 TOKEN_CONFIG = {
     'token_name': 'TEST',
@@ -34,11 +60,426 @@ TOKEN_CONFIG = {
     'min_points_for_distribution': 100
 }
 
+# Task catalog of the default campaign: (task_id, task_name, points)
+DEFAULT_TASKS = [
+    ('join_airdrop', 'Join Airdrop', 100),
+    ('follow_twitter', 'Follow us on Twitter', 50),
+    ('retweet', 'Retweet our pinned post', 75),
+    ('join_telegram', 'Join our Telegram', 50),
+    ('invite_friends', 'Invite 3 friends', 150)
+]
+
+# Structured logging. Records are queued in the request thread and written
+# as JSON lines by a background listener, so a slow log collector never
+# blocks a worker. Levels: LOG_LEVEL for everything, LOG_LEVELS for
+# per-module overrides, e.g. "airdrop.twitter=DEBUG,airdrop.db=WARNING".
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_LEVELS = os.getenv('LOG_LEVELS', '')
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+LOG_REPEAT_WINDOW_SECONDS = 60
+LOG_REPEAT_BURST = 5
+LOG_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+# Request ID, route and campaign of the request being served
+log_context = contextvars.ContextVar('log_context', default=None)
+
+class RepeatedMessageFilter(logging.Filter):
+    """Let each warning/error message through LOG_REPEAT_BURST times per window.
+
+    The first record after a window with drops carries a suppressed count.
+    """
+
+    def __init__(self, window_seconds, burst):
+        super().__init__()
+        self.window_seconds = window_seconds
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._windows = {}  # (logger, msg) -> [window_start, emitted, suppressed]
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING:
+            return True
+        
+        now = time.monotonic()
+        key = (record.name, record.msg)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                if window and window[2]:
+                    record.suppressed = window[2]
+                self._windows[key] = [now, 1, 0]
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+class LogContextFilter(logging.Filter):
+    """Stamp records with the current request's log context"""
+
+    def filter(self, record):
+        record.context = log_context.get()
+        return True
+
+class AsyncLogHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks the caller: formatting happens in the
+    writer thread and records are dropped (and counted) when the queue is full"""
+
+    def __init__(self, queue_size):
+        super().__init__(queue.SimpleQueue())
+        self.queue_size = queue_size
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        # SimpleQueue has no maxsize; the bound is checked here instead
+        if self.queue.qsize() >= self.queue_size:
+            self.dropped += 1
+        else:
+            self.queue.put(record)
+
+    def stats(self):
+        return {'queued': self.queue.qsize(), 'dropped': self.dropped}
+
+class JsonLogFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update(getattr(record, 'context', None) or {})
+        for key, value in vars(record).items():
+            if key not in LOG_RECORD_ATTRS and key != 'context':
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+def start_log_listener():
+    """(Re)start the background writer; also run in forked workers, whose copy of the thread is gone"""
+    global log_listener
+    log_handler.queue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(log_handler.queue, log_writer, respect_handler_level=True)
+    log_listener.start()
+
+def configure_logging():
+    # Skip caller lookup and thread/process names when building records
+    # (see "Optimization" in the logging HOWTO); the JSON lines don't use them
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
+    root = logging.getLogger('airdrop')
+    root.setLevel(LOG_LEVEL)
+    root.propagate = False
+    root.addHandler(log_handler)
+    for override in filter(None, LOG_LEVELS.split(',')):
+        name, _, level = override.partition('=')
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+    
+    start_log_listener()
+    os.register_at_fork(after_in_child=start_log_listener)
+    atexit.register(lambda: log_listener.stop())
+
+log_writer = logging.StreamHandler(sys.stdout)
+log_writer.setFormatter(JsonLogFormatter())
+log_handler = AsyncLogHandler(LOG_QUEUE_SIZE)
+log_handler.addFilter(RepeatedMessageFilter(LOG_REPEAT_WINDOW_SECONDS, LOG_REPEAT_BURST))
+log_handler.addFilter(LogContextFilter())
+log_listener = None
+configure_logging()
+
+web_log = logging.getLogger('airdrop.web')
+db_log = logging.getLogger('airdrop.db')
+users_log = logging.getLogger('airdrop.users')
+tokens_log = logging.getLogger('airdrop.tokens')
+twitter_log = logging.getLogger('airdrop.twitter')
+events_log = logging.getLogger('airdrop.events')
+eligibility_log = logging.getLogger('airdrop.eligibility')
+
+# Live event feed for /events. Events are appended to a small SQLite file
+# shared by every worker on the host, and each worker tails it and fans new
+# rows out to its own open streams, so a stream sees writes served by any
+# worker and event ids (Last-Event-ID) mean the same thing everywhere.
+EVENTS_DB = os.getenv('EVENTS_DB', 'events.db')
+EVENT_HEARTBEAT_SECONDS = 15
+EVENT_POLL_SECONDS = 0.25
+EVENT_SUBSCRIBER_QUEUE_SIZE = 256
+EVENT_REPLAY_SIZE = 1000  # enough to cover a replica refresh interval of writes
+EVENT_PRUNE_EVERY = 100
+
+def connect_events():
+    return sqlite3.connect(EVENTS_DB, timeout=10, isolation_level=None)
+
+def init_events():
+    conn = connect_events()
+    c = conn.cursor()
+    
+    c.execute('PRAGMA journal_mode=WAL')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            data TEXT NOT NULL,
+            published_at REAL NOT NULL
+        )
+    ''')
+    # Publish time of the newest pruned event; nothing before the file existed can be replayed
+    c.execute('CREATE TABLE IF NOT EXISTS events_meta (evicted_at REAL NOT NULL)')
+    c.execute('INSERT INTO events_meta (evicted_at) SELECT ? WHERE NOT EXISTS (SELECT 1 FROM events_meta)',
+              (time.time(),))
+    conn.close()
+
+init_events()
+
+def event_from_row(row):
+    return {'id': row[0], 'type': row[1], 'data': json.loads(row[2]), 'published_at': row[3]}
+
+class EventBroker:
+    """Fan out write-path events from every worker to the /events streams open in this one"""
+
+    def __init__(self, replay_size=EVENT_REPLAY_SIZE):
+        self.replay_size = replay_size
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._last_id = None  # newest event handed to subscribers by this worker's tailer
+        self._tailer_pid = None
+
+    def publish(self, event_type, data):
+        conn = connect_events()
+        try:
+            c = conn.cursor()
+            c.execute('INSERT INTO events (type, data, published_at) VALUES (?, ?, ?)',
+                      (event_type, json.dumps(data), time.time()))
+            event_id = c.lastrowid
+            if event_id % EVENT_PRUNE_EVERY == 0:
+                self._prune(c, event_id - self.replay_size)
+        finally:
+            conn.close()
+
+    def _prune(self, c, max_id):
+        c.execute('BEGIN IMMEDIATE')
+        try:
+            c.execute('SELECT MAX(published_at) FROM events WHERE id <= ?', (max_id,))
+            evicted_at = c.fetchone()[0]
+            if evicted_at is not None:
+                c.execute('DELETE FROM events WHERE id <= ?', (max_id,))
+                c.execute('UPDATE events_meta SET evicted_at = MAX(evicted_at, ?)', (evicted_at,))
+            c.execute('COMMIT')
+        except Exception:
+            c.execute('ROLLBACK')
+            raise
+
+    def subscribe(self, last_event_id=None, since=None):
+        """Subscribe, replaying events after last_event_id, or else published after since.
+
+        Returns (subscriber, complete); complete is False when events after
+        since have already been pruned from the replay window.
+        """
+        self._ensure_tailer()
+        subscriber = queue.Queue(maxsize=EVENT_SUBSCRIBER_QUEUE_SIZE)
+        complete = True
+        conn = connect_events()
+        try:
+            c = conn.cursor()
+            # Under the lock the tailer cannot deliver past _last_id, so the
+            # replay and the live feed meet without a gap or a duplicate
+            with self._lock:
+                replay = []
+                if last_event_id is not None:
+                    c.execute('''
+                        SELECT id, type, data, published_at FROM events WHERE id > ? AND id <= ?
+                        ORDER BY id DESC LIMIT ?
+                    ''', (last_event_id, self._last_id, EVENT_SUBSCRIBER_QUEUE_SIZE))
+                    replay = c.fetchall()
+                elif since is not None:
+                    c.execute('SELECT evicted_at FROM events_meta')
+                    complete = since >= c.fetchone()[0]
+                    c.execute('''
+                        SELECT id, type, data, published_at FROM events WHERE published_at > ? AND id <= ?
+                        ORDER BY id DESC LIMIT ?
+                    ''', (since, self._last_id, EVENT_SUBSCRIBER_QUEUE_SIZE))
+                    replay = c.fetchall()
+                for row in reversed(replay):
+                    subscriber.put_nowait(event_from_row(row))
+                self._subscribers.add(subscriber)
+        finally:
+            conn.close()
+        return subscriber, complete
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def is_subscribed(self, subscriber):
+        with self._lock:
+            return subscriber in self._subscribers
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def _ensure_tailer(self):
+        """Start tailing the events file in this process (once per worker, after fork)"""
+        with self._lock:
+            if self._tailer_pid == os.getpid():
+                return
+            self._tailer_pid = os.getpid()
+            conn = connect_events()
+            try:
+                self._last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM events').fetchone()[0]
+            finally:
+                conn.close()
+        threading.Thread(target=self._run_tailer, name='events-tailer', daemon=True).start()
+
+    def _run_tailer(self):
+        conn = connect_events()
+        while True:
+            time.sleep(EVENT_POLL_SECONDS)
+            try:
+                if not self.subscriber_count():
+                    with self._lock:
+                        self._last_id = conn.execute('SELECT COALESCE(MAX(id), ?) FROM events',
+                                                     (self._last_id,)).fetchone()[0]
+                    continue
+                rows = conn.execute('SELECT id, type, data, published_at FROM events WHERE id > ? ORDER BY id',
+                                    (self._last_id,)).fetchall()
+                if not rows:
+                    continue
+                with self._lock:
+                    self._last_id = rows[-1][0]
+                    subscribers = list(self._subscribers)
+                for event in map(event_from_row, rows):
+                    for subscriber in subscribers:
+                        try:
+                            subscriber.put_nowait(event)
+                        except queue.Full:
+                            # Slow client - drop it, EventSource will reconnect and replay
+                            self.unsubscribe(subscriber)
+            except Exception:
+                events_log.exception('Error tailing events')
+
+event_broker = EventBroker()
+
+def publish_event(event_type, data):
+    """Publish a dashboard delta; never let a broadcast fail the write path"""
+    try:
+        event_broker.publish(event_type, {**data, 'campaign': current_campaign().slug})
+    except Exception:
+        events_log.exception('Error publishing event')
+
+def format_sse(event):
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+# Time-bucketed rollups for /stats/timeseries
+STATS_RESOLUTIONS = {'minute': ('stats_minute', 60), 'hour': ('stats_hour', 3600)}
+STATS_METRICS = ('registrations', 'referred_registrations', 'task_completions', 'referral_conversion')
+STATS_MAX_BUCKETS = 10000
+
+def record_rollup(c, metric, dimension='', amount=1, timestamp=None):
+    """Add to the minute and hour buckets for timestamp, inside the caller's transaction.
+
+    Late events land in the bucket of their own timestamp, not the current one.
+    """
+    timestamp = int(timestamp if timestamp is not None else time.time())
+    for table, width in STATS_RESOLUTIONS.values():
+        c.execute(f'''
+            INSERT INTO {table} (metric, dimension, bucket, value) VALUES (?, ?, ?, ?)
+            ON CONFLICT (metric, dimension, bucket) DO UPDATE SET value = value + excluded.value
+        ''', (metric, dimension, timestamp - timestamp % width, amount))
+
+def rebuild_rollups(c, since=0):
+    """Recompute every bucket from since onwards from the base tables"""
+    sources = [
+        ("'registrations'", "''", 'users', 'registered_at', '1'),
+        ("'referred_registrations'", "''", 'users', 'registered_at', 'referred_by IS NOT NULL'),
+        ("'task_completions'", 'task_name', 'user_tasks', 'completed_at', 'completed'),
+    ]
+    for table, width in STATS_RESOLUTIONS.values():
+        c.execute(f'DELETE FROM {table} WHERE bucket >= ?', (since - since % width,))
+        for metric, dimension, source, column, condition in sources:
+            c.execute(f'''
+                INSERT INTO {table} (metric, dimension, bucket, value)
+                SELECT {metric}, {dimension}, CAST(strftime('%s', {column}) AS INTEGER) / {width} * {width} AS bucket,
+                       COUNT(*)
+                FROM {source}
+                WHERE {condition} AND {column} IS NOT NULL
+                  AND CAST(strftime('%s', {column}) AS INTEGER) >= ?
+                GROUP BY 2, 3
+            ''', (since - since % width,))
+
+def parse_stats_time(value, default):
+    """Accept epoch seconds or an ISO timestamp (UTC)"""
+    if not value:
+        return default
+    if value.isdigit():
+        return int(value)
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+# Wallet columns rewritten by the checksum migration: (table, column)
+WALLET_COLUMNS = (
+    ('users', 'wallet_address'), ('users', 'referred_by'),
+    ('user_tasks', 'wallet_address'), ('token_distribution', 'wallet_address'),
+    ('twitter_verification', 'wallet_address'),
+    ('referrals', 'referrer_wallet'), ('referrals', 'referred_wallet')
+)
+
+def migrate_wallet_checksums(c):
+    """Rewrite wallets stored before EIP-55 canonicalization to checksum form.
+
+    Addresses whose checksum form is already registered (the same wallet
+    signed up twice in different casing) are left alone and returned so
+    they can be merged by hand.
+    """
+    c.execute('CREATE TEMP TABLE wallet_migration (old TEXT PRIMARY KEY, new TEXT NOT NULL)')
+    lookup = c.connection.cursor()
+    targets = set()
+    collisions = []
+    # Streamed in index order so the first casing of a duplicated wallet wins
+    for (wallet_address,) in c.connection.execute('SELECT wallet_address FROM users ORDER BY wallet_address'):
+        if not is_valid_wallet_address(wallet_address):
+            continue
+        checksummed = to_checksum_address(wallet_address)
+        if checksummed == wallet_address:
+            continue
+        lookup.execute('SELECT 1 FROM users WHERE wallet_address = ?', (checksummed,))
+        if checksummed in targets or lookup.fetchone():
+            collisions.append(wallet_address)
+            continue
+        targets.add(checksummed)
+        lookup.execute('INSERT INTO wallet_migration (old, new) VALUES (?, ?)', (wallet_address, checksummed))
+    
+    if targets:
+        for table, column in WALLET_COLUMNS:
+            c.execute(f'''
+                UPDATE {table} SET {column} = m.new FROM wallet_migration m
+                WHERE {table}.{column} = m.old
+            ''')
+    c.execute('DROP TABLE wallet_migration')
+    
+    if targets or collisions:
+        db_log.warning('Migrated wallets to checksum form', extra={
+            'migrated': len(targets), 'collisions': len(collisions), 'colliding_wallets': collisions[:100]
+        })
+    return collisions
+
 # Database initialization
-def init_db():
-    conn = sqlite3.connect('airdrop.db')
+def init_db(db_path='airdrop.db'):
+    conn = sqlite3.connect(db_path)
     c = conn.cursor()
     
+    # WAL lets long reads (exports, reports) run on a snapshot without blocking signups
+    c.execute('PRAGMA journal_mode=WAL')
+    
     # Users table
     c.execute('''
         CREATE TABLE IF NOT EXISTS users (
@@ -116,12 +557,574 @@ def init_db():
         )
     ''')
     
+    # On-chain activity cache (per pinned block) and the eligibility flags derived from it
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS onchain_activity (
+            block_number INTEGER NOT NULL,
+            wallet_address TEXT NOT NULL,
+            balance_wei TEXT NOT NULL,
+            tx_count INTEGER NOT NULL,
+            checked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (block_number, wallet_address)
+        ) WITHOUT ROWID
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS wallet_eligibility (
+            wallet_address TEXT PRIMARY KEY,
+            block_number INTEGER NOT NULL,
+            has_balance BOOLEAN NOT NULL,
+            has_transactions BOOLEAN NOT NULL,
+            eligible BOOLEAN NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Rollup tables for /stats/timeseries (bucket = epoch seconds at bucket start)
+    c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats_hour'")
+    rollups_exist = c.fetchone() is not None
+    for table in ('stats_minute', 'stats_hour'):
+        c.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                metric TEXT NOT NULL,
+                dimension TEXT NOT NULL DEFAULT '',
+                bucket INTEGER NOT NULL,
+                value INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (metric, dimension, bucket)
+            ) WITHOUT ROWID
+        ''')
+    if not rollups_exist:
+        rebuild_rollups(c)
+    
+    # Admin search index: trigram FTS5 over the users table, kept in sync by triggers
+    c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_search'")
+    search_index_exists = c.fetchone() is not None
+    c.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS users_search USING fts5(
+            wallet_address, twitter_handle, email, referral_code,
+            content='users', content_rowid='id', tokenize='trigram'
+        )
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS users_search_insert AFTER INSERT ON users BEGIN
+            INSERT INTO users_search (rowid, wallet_address, twitter_handle, email, referral_code)
+            VALUES (new.id, new.wallet_address, new.twitter_handle, new.email, new.referral_code);
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS users_search_delete AFTER DELETE ON users BEGIN
+            INSERT INTO users_search (users_search, rowid, wallet_address, twitter_handle, email, referral_code)
+            VALUES ('delete', old.id, old.wallet_address, old.twitter_handle, old.email, old.referral_code);
+        END
+    ''')
+    # Only fires for the indexed columns, so points updates never touch the index
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS users_search_update
+        AFTER UPDATE OF wallet_address, twitter_handle, email, referral_code ON users BEGIN
+            INSERT INTO users_search (users_search, rowid, wallet_address, twitter_handle, email, referral_code)
+            VALUES ('delete', old.id, old.wallet_address, old.twitter_handle, old.email, old.referral_code);
+            INSERT INTO users_search (rowid, wallet_address, twitter_handle, email, referral_code)
+            VALUES (new.id, new.wallet_address, new.twitter_handle, new.email, new.referral_code);
+        END
+    ''')
+    if not search_index_exists:
+        c.execute("INSERT INTO users_search (users_search) VALUES ('rebuild')")
+    
+    # Schema version 1: wallets stored in EIP-55 checksum form
+    c.execute('PRAGMA user_version')
+    if c.fetchone()[0] < 1:
+        migrate_wallet_checksums(c)
+        c.execute('PRAGMA user_version = 1')
+    
     conn.commit()
     conn.close()
-    print("✅ Database initialized successfully!")
+    db_log.info('Database initialized', extra={'db_path': db_path})
+
+# Read replica for analytics routes
+REPLICA_DB_PATH = os.getenv('REPLICA_DB_PATH', 'airdrop_replica.db')
+REPLICA_REFRESH_SECONDS = int(os.getenv('REPLICA_REFRESH_SECONDS', '60'))
+REPLICA_REFRESH_WRITES = int(os.getenv('REPLICA_REFRESH_WRITES', '500'))
+# No worker copies the primary again if the replica is younger than this
+REPLICA_MIN_REFRESH_SECONDS = int(os.getenv('REPLICA_MIN_REFRESH_SECONDS', '10'))
+
+class ReplicaManager:
+    """Keep a read-only copy of the primary database for dashboards, exports and reports"""
+
+    def __init__(self, primary_path, replica_path, refresh_seconds, refresh_writes):
+        self.primary_path = primary_path
+        self.replica_path = replica_path
+        self.refresh_seconds = refresh_seconds
+        self.refresh_writes = refresh_writes
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._writes = 0
+        self._scheduler_pid = None
+
+    def refresh(self, wait=False, min_age=REPLICA_MIN_REFRESH_SECONDS):
+        """Copy the primary with the online backup API and atomically swap it in.
+
+        Only one worker on the host copies at a time (flock on a lock file),
+        and none does if the replica is younger than min_age. With wait=False
+        a refresh already running elsewhere is skipped rather than awaited.
+        """
+        if not self._refresh_lock.acquire(blocking=wait):
+            return False
+        try:
+            with open(f'{self.replica_path}.lock', 'a') as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return False
+                
+                # Another worker may have refreshed it while we waited
+                refreshed_at = self.refreshed_at()
+                if refreshed_at is not None and time.time() - refreshed_at < min_age:
+                    return False
+                return self._copy_primary()
+        finally:
+            self._refresh_lock.release()
+
+    def _copy_primary(self):
+        tmp_path = f'{self.replica_path}.{os.getpid()}.tmp'
+        try:
+            snapshot_at = time.time()
+            src = sqlite3.connect(self.primary_path)
+            dst = sqlite3.connect(tmp_path)
+            try:
+                # One-step backup: a single read transaction, which WAL lets
+                # writers run alongside
+                src.backup(dst)
+                dst.execute('PRAGMA journal_mode=DELETE')
+                dst.execute('CREATE TABLE IF NOT EXISTS replica_meta (refreshed_at REAL NOT NULL)')
+                dst.execute('DELETE FROM replica_meta')
+                dst.execute('INSERT INTO replica_meta (refreshed_at) VALUES (?)', (snapshot_at,))
+                dst.commit()
+            finally:
+                dst.close()
+                src.close()
+            
+            os.replace(tmp_path, self.replica_path)
+            return True
+        except Exception:
+            db_log.exception('Error refreshing replica')
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def note_write(self):
+        """Count a primary write; try a background refresh every refresh_writes writes"""
+        with self._lock:
+            self._writes += 1
+            due = self._writes >= self.refresh_writes and not self._refresh_lock.locked()
+            if due:
+                self._writes = 0
+        if due:
+            threading.Thread(target=self.refresh, name='replica-refresh', daemon=True).start()
+
+    def connect(self, max_age=None):
+        """Open a read-only connection to the replica, creating it (or refreshing
+        it when older than max_age seconds) first and waiting for any copy in progress"""
+        self._ensure_scheduler()
+        if not os.path.exists(self.replica_path):
+            self.refresh(wait=True, min_age=float('inf'))
+        elif max_age is not None:
+            self.refresh(wait=True, min_age=max_age)
+        return sqlite3.connect(f'file:{self.replica_path}?mode=ro', uri=True)
+
+    def refreshed_at(self, conn=None):
+        """Snapshot time of the replica, or of the one conn has open"""
+        try:
+            if conn is not None:
+                row = conn.execute('SELECT refreshed_at FROM replica_meta').fetchone()
+                return row[0] if row else None
+            conn = sqlite3.connect(f'file:{self.replica_path}?mode=ro', uri=True)
+            try:
+                row = conn.execute('SELECT refreshed_at FROM replica_meta').fetchone()
+            finally:
+                conn.close()
+            return row[0] if row else None
+        except sqlite3.Error:
+            return None
+
+    def status(self, conn=None):
+        refreshed_at = self.refreshed_at(conn)
+        if refreshed_at is None:
+            return {'refreshed_at': None, 'staleness_seconds': None, 'snapshot_at': None}
+        return {
+            'refreshed_at': datetime.utcfromtimestamp(refreshed_at).strftime('%Y-%m-%d %H:%M:%S'),
+            'staleness_seconds': int(time.time() - refreshed_at),
+            'snapshot_at': refreshed_at
+        }
+
+    def _ensure_scheduler(self):
+        # Started lazily (and again after a fork) so each worker has its own timer
+        with self._lock:
+            if self._scheduler_pid == os.getpid():
+                return
+            self._scheduler_pid = os.getpid()
+        threading.Thread(target=self._run_schedule, name='replica-schedule', daemon=True).start()
+
+    def _run_schedule(self):
+        while True:
+            time.sleep(self.refresh_seconds)
+            # Skipped if another worker refreshed it within the interval
+            self.refresh(min_age=self.refresh_seconds)
+
+# Admission filters for duplicate wallets and referral codes
+ADMISSION_FILTER_CAPACITY = int(os.getenv('ADMISSION_FILTER_CAPACITY', '1000000'))
+ADMISSION_FILTER_ERROR_RATE = float(os.getenv('ADMISSION_FILTER_ERROR_RATE', '0.001'))
+ADMISSION_FILTER_SYNC_SECONDS = int(os.getenv('ADMISSION_FILTER_SYNC_SECONDS', '30'))
+REFERRAL_CODE_ATTEMPTS = 5
+
+class BloomFilter:
+    """Fixed-size Bloom filter; positions come from double hashing one blake2b digest"""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def add(self, item):
+        """Set the item's bits; returns False if they were all set already"""
+        bits = self.bits
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class ScalableBloomFilter:
+    """Chain of Bloom filters that doubles capacity (and tightens error rate) as it fills"""
+
+    def __init__(self, initial_capacity, error_rate):
+        self.error_rate = error_rate
+        self.filters = [BloomFilter(initial_capacity, error_rate / 2)]
+
+    def add(self, item):
+        if len(self.filters) > 1 and any(item in bloom for bloom in self.filters[:-1]):
+            return
+        current = self.filters[-1]
+        if current.count >= current.capacity:
+            current = BloomFilter(current.capacity * 2, self.error_rate / 2 ** (len(self.filters) + 1))
+            self.filters.append(current)
+        current.add(item)
+
+    def __contains__(self, item):
+        return any(item in bloom for bloom in self.filters)
+
+    def __len__(self):
+        return sum(bloom.count for bloom in self.filters)
+
+    def memory_bytes(self):
+        return sum(len(bloom.bits) for bloom in self.filters)
+
+class AdmissionFilter:
+    """Per-worker filters of registered wallets and issued referral codes.
+
+    A miss means the value has definitely not been seen, so new wallets go
+    straight to INSERT. A hit is confirmed with one indexed lookup. The
+    filters load in a background streaming pass; until that finishes every
+    check falls back to the database, and rows other workers insert are
+    picked up by a periodic sync on users.id.
+    """
+
+    def __init__(self, db_path, capacity, error_rate, sync_seconds):
+        self.db_path = db_path
+        self.sync_seconds = sync_seconds
+        self.wallets = ScalableBloomFilter(capacity, error_rate)
+        self.referral_codes = ScalableBloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._last_user_id = 0
+        self._synced_at = 0
+        self._loaded = False
+        self._loader_pid = None
+
+    def sync(self):
+        """Stream users added since the last sync into the filters"""
+        with self._sync_lock:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                c = conn.cursor()
+                c.execute('''
+                    SELECT id, wallet_address, referral_code FROM users
+                    WHERE id > ? ORDER BY id
+                ''', (self._last_user_id,))
+                while True:
+                    rows = c.fetchmany(10000)
+                    if not rows:
+                        break
+                    # Lock per batch so request-path inserts never wait on a full load
+                    with self._lock:
+                        for user_id, wallet_address, referral_code in rows:
+                            self.wallets.add(wallet_address)
+                            if referral_code:
+                                self.referral_codes.add(referral_code)
+                    self._last_user_id = rows[-1][0]
+            finally:
+                conn.close()
+            self._synced_at = time.time()
+
+    def _load(self):
+        try:
+            self.sync()
+            self._loaded = True
+        except Exception:
+            db_log.exception('Error loading admission filters')
+            self._loader_pid = None
+
+    def ready(self):
+        """True once loaded; kicks off the background load (once per worker) otherwise"""
+        if self._loaded:
+            if time.time() - self._synced_at >= self.sync_seconds:
+                self.sync()
+            return True
+        
+        with self._lock:
+            if self._loader_pid != os.getpid():
+                self._loader_pid = os.getpid()
+                threading.Thread(target=self._load, name='admission-load', daemon=True).start()
+        return False
+
+    def wallet_registered(self, wallet_address):
+        """True only for confirmed duplicates; unknown or not-yet-loaded means try the INSERT"""
+        if not self.ready() or wallet_address not in self.wallets:
+            return False
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            c = conn.cursor()
+            c.execute('SELECT 1 FROM users WHERE wallet_address = ?', (wallet_address,))
+            return c.fetchone() is not None
+        finally:
+            conn.close()
+
+    def might_have_referral_code(self, referral_code):
+        if not self.ready() or referral_code in self.referral_codes:
+            return True
+        # The referrer may have signed up on another worker moments ago
+        if time.time() - self._synced_at >= 1:
+            self.sync()
+            return referral_code in self.referral_codes
+        return False
+
+    def issue_referral_code(self):
+        """Draw a referral code no known user holds"""
+        if not self.ready():
+            return generate_referral_code()
+        while True:
+            referral_code = generate_referral_code()
+            if referral_code not in self.referral_codes:
+                return referral_code
+
+    def add_wallet(self, wallet_address):
+        with self._lock:
+            self.wallets.add(wallet_address)
+
+    def add_referral_code(self, referral_code):
+        with self._lock:
+            self.referral_codes.add(referral_code)
+
+    def stats(self):
+        return {
+            'loaded': self._loaded,
+            'wallets': len(self.wallets),
+            'referral_codes': len(self.referral_codes),
+            'memory_bytes': self.wallets.memory_bytes() + self.referral_codes.memory_bytes()
+        }
+
+# Campaigns: each campaign has its own token config, task catalog and SQLite
+# file. Routes are served at / for the default campaign and under
+# /c/<campaign>/ for the others.
+DEFAULT_CAMPAIGN = 'default'
+CAMPAIGNS_FILE = os.getenv('CAMPAIGNS_FILE', 'campaigns.json')
+CAMPAIGN_DATA_DIR = os.getenv('CAMPAIGN_DATA_DIR', '.')
+CAMPAIGN_SLUG_PATTERN = re.compile(r'^[a-z0-9][a-z0-9-]{0,62}$')
+DB_POOL_MAX_IDLE_PER_CAMPAIGN = int(os.getenv('DB_POOL_MAX_IDLE_PER_CAMPAIGN', '4'))
+DB_POOL_MAX_IDLE_TOTAL = int(os.getenv('DB_POOL_MAX_IDLE_TOTAL', '64'))
+DB_BUSY_TIMEOUT = 30
+
+class Campaign:
+    """One airdrop: token config, task catalog and its own database file"""
+
+    def __init__(self, slug, name, db_path, token_config, tasks, replica_path=None):
+        self.slug = slug
+        self.name = name
+        self.db_path = db_path
+        self.token_config = token_config
+        self.tasks = tasks  # [(task_id, task_name, points)]
+        self.task_points = {task_id: points for task_id, _, points in tasks}
+        self.replica_path = replica_path or f'{os.path.splitext(db_path)[0]}_replica.db'
+        self._replica = None
+        self._admission = None
+        self._lock = threading.Lock()
+
+    @property
+    def url_prefix(self):
+        return '' if self.slug == DEFAULT_CAMPAIGN else f'/c/{self.slug}'
+
+    @property
+    def replica(self):
+        with self._lock:
+            if self._replica is None:
+                db_pool.ensure_initialized(self)
+                self._replica = ReplicaManager(self.db_path, self.replica_path,
+                                               REPLICA_REFRESH_SECONDS, REPLICA_REFRESH_WRITES)
+            return self._replica
+
+    @property
+    def admission(self):
+        with self._lock:
+            if self._admission is None:
+                db_pool.ensure_initialized(self)
+                self._admission = AdmissionFilter(self.db_path, ADMISSION_FILTER_CAPACITY,
+                                                  ADMISSION_FILTER_ERROR_RATE, ADMISSION_FILTER_SYNC_SECONDS)
+            return self._admission
+
+def load_campaigns():
+    """Build the campaign registry from CAMPAIGNS_FILE; the default campaign always exists"""
+    campaigns = {
+        DEFAULT_CAMPAIGN: Campaign(DEFAULT_CAMPAIGN, 'Crypto Airdrop', 'airdrop.db', TOKEN_CONFIG, DEFAULT_TASKS,
+                                   replica_path=REPLICA_DB_PATH)
+    }
+    if not os.path.exists(CAMPAIGNS_FILE):
+        return campaigns
+    
+    with open(CAMPAIGNS_FILE, encoding='utf-8') as f:
+        definitions = json.load(f)
+    
+    for slug, definition in definitions.items():
+        if not CAMPAIGN_SLUG_PATTERN.match(slug):
+            raise ValueError(f'Invalid campaign slug: {slug!r}')
+        default = campaigns.get(slug)
+        tasks = [(task['id'], task['name'], task['points']) for task in definition.get('tasks', [])]
+        campaigns[slug] = Campaign(
+            slug,
+            definition.get('name', slug),
+            definition.get('database') or (default.db_path if default else os.path.join(CAMPAIGN_DATA_DIR, f'{slug}.db')),
+            {**TOKEN_CONFIG, **definition.get('token', {})},
+            tasks or DEFAULT_TASKS,
+            replica_path=definition.get('replica_database') or (default.replica_path if default else None)
+        )
+    return campaigns
+
+def get_campaign(slug):
+    campaign = CAMPAIGNS.get(slug)
+    if campaign is None:
+        abort(404)
+    return campaign
+
+def current_campaign():
+    """Campaign of the current request or CLI command, else the default one"""
+    if has_app_context() and 'campaign' in g:
+        return g.campaign
+    return CAMPAIGNS[DEFAULT_CAMPAIGN]
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to its campaign's pool"""
+
+    def close(self):
+        db_pool.release(self)
+
+    def really_close(self):
+        super().close()
+
+class CampaignDatabasePool:
+    """Lazily opened per-campaign connections with a bounded number kept idle.
+
+    Each campaign writes to its own file, so a busy campaign never holds
+    the write lock for the others.
+    """
+
+    def __init__(self, max_idle_per_campaign, max_idle_total):
+        self.max_idle_per_campaign = max_idle_per_campaign
+        self.max_idle_total = max_idle_total
+        self._lock = threading.Lock()
+        self._idle = OrderedDict()  # db_path -> deque of connections, least recently used first
+        self._idle_count = 0
+        self._initialized = set()
+
+    def ensure_initialized(self, campaign):
+        if campaign.db_path in self._initialized:
+            return
+        with self._lock:
+            if campaign.db_path not in self._initialized:
+                init_db(campaign.db_path)
+                self._initialized.add(campaign.db_path)
+
+    def acquire(self, campaign, isolation_level=''):
+        self.ensure_initialized(campaign)
+        conn = None
+        with self._lock:
+            idle = self._idle.get(campaign.db_path)
+            if idle:
+                conn = idle.pop()
+                self._idle_count -= 1
+        
+        if conn is None:
+            conn = sqlite3.connect(campaign.db_path, timeout=DB_BUSY_TIMEOUT,
+                                   factory=PooledConnection, check_same_thread=False)
+            conn.db_path = campaign.db_path
+        conn.isolation_level = isolation_level
+        return conn
+
+    def release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.really_close()
+            return
+        
+        evicted = []
+        with self._lock:
+            idle = self._idle.setdefault(conn.db_path, deque())
+            self._idle.move_to_end(conn.db_path)
+            if len(idle) >= self.max_idle_per_campaign:
+                evicted.append(conn)
+            else:
+                idle.append(conn)
+                self._idle_count += 1
+            
+            # Over the global cap: close idle connections of the least recently used campaigns
+            while self._idle_count > self.max_idle_total:
+                db_path, oldest = next(iter(self._idle.items()))
+                if oldest:
+                    evicted.append(oldest.popleft())
+                    self._idle_count -= 1
+                if not oldest:
+                    del self._idle[db_path]
+        
+        for stale in evicted:
+            stale.really_close()
+
+    def stats(self):
+        with self._lock:
+            return {'idle_connections': self._idle_count, 'campaigns_open': len(self._idle)}
+
+db_pool = CampaignDatabasePool(DB_POOL_MAX_IDLE_PER_CAMPAIGN, DB_POOL_MAX_IDLE_TOTAL)
 
-# Initialize database
-init_db()
+def connect_db(isolation_level=''):
+    """Pooled connection to the current campaign's database"""
+    return db_pool.acquire(current_campaign(), isolation_level)
+
+CAMPAIGNS = load_campaigns()
 
 # Helper functions
 def generate_referral_code():
@@ -129,23 +1132,38 @@ def generate_referral_code():
     return ''.join(secrets.choice(characters) for _ in range(8))
 
 def add_user(wallet_address, email=None, twitter_handle=None, referral_code=None):
-    conn = sqlite3.connect('airdrop.db')
-    c = conn.cursor()
+    admission = current_campaign().admission
     
-    user_referral_code = generate_referral_code()
+    # Known duplicates are turned away before any write
+    if admission.wallet_registered(wallet_address):
+        return False, None
+    
+    conn = connect_db()
+    c = conn.cursor()
     
     try:
         referred_by = None
-        if referral_code and referral_code.strip():
+        if referral_code and referral_code.strip() and admission.might_have_referral_code(referral_code):
             c.execute('SELECT wallet_address FROM users WHERE referral_code = ?', (referral_code,))
             result = c.fetchone()
             if result:
                 referred_by = result[0]
         
-        c.execute('''
-            INSERT INTO users (wallet_address, email, twitter_handle, referral_code, referred_by)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (wallet_address, email, twitter_handle, user_referral_code, referred_by))
+        for _ in range(REFERRAL_CODE_ATTEMPTS):
+            user_referral_code = admission.issue_referral_code()
+            try:
+                c.execute('''
+                    INSERT INTO users (wallet_address, email, twitter_handle, referral_code, referred_by)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (wallet_address, email, twitter_handle, user_referral_code, referred_by))
+                break
+            except sqlite3.IntegrityError as e:
+                if 'referral_code' not in str(e):
+                    raise
+                # Issued by another worker since our last sync
+                admission.add_referral_code(user_referral_code)
+        else:
+            raise RuntimeError('Could not issue a unique referral code')
         
         # If referred, add to referrals table and give points
         if referred_by:
@@ -156,30 +1174,35 @@ def add_user(wallet_address, email=None, twitter_handle=None, referral_code=None
             
             # Give points to referrer
             c.execute('UPDATE users SET points = points + 50 WHERE wallet_address = ?', (referred_by,))
+            record_rollup(c, 'referred_registrations')
         
+        record_rollup(c, 'registrations')
         conn.commit()
+        admission.add_wallet(wallet_address)
+        admission.add_referral_code(user_referral_code)
+        current_campaign().replica.note_write()
+        publish_event('registration', {
+            'wallet_address': wallet_address,
+            'twitter_handle': twitter_handle or None,
+            'referred_by': referred_by,
+            'referrer_points': 50 if referred_by else 0,
+            'registered_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        })
         return True, user_referral_code
     except sqlite3.IntegrityError:
+        admission.add_wallet(wallet_address)
         return False, None
-    except Exception as e:
-        print(f"❌ Error adding user: {e}")
+    except Exception:
+        users_log.exception('Error adding user')
         return False, None
     finally:
         conn.close()
 
 def initialize_user_tasks(wallet_address):
-    conn = sqlite3.connect('airdrop.db')
+    conn = connect_db()
     c = conn.cursor()
     
-    tasks = [
-        ('join_airdrop', 'Join Airdrop'),
-        ('follow_twitter', 'Follow us on Twitter'),
-        ('retweet', 'Retweet our pinned post'),
-        ('join_telegram', 'Join our Telegram'),
-        ('invite_friends', 'Invite 3 friends')
-    ]
-    
-    for task_id, task_name in tasks:
+    for task_id, _, _ in current_campaign().tasks:
         c.execute('''
             INSERT OR IGNORE INTO user_tasks (wallet_address, task_name)
             VALUES (?, ?)
@@ -189,20 +1212,16 @@ def initialize_user_tasks(wallet_address):
     conn.close()
 
 def complete_task(wallet_address, task_name, proof_data=None):
-    conn = sqlite3.connect('airdrop.db')
+    conn = connect_db()
     c = conn.cursor()
     
     try:
         # Determine points based on task
-        task_points = {
-            'join_airdrop': 100,
-            'follow_twitter': 50,
-            'retweet': 75,
-            'join_telegram': 50,
-            'invite_friends': 150
-        }
+        points_earned = current_campaign().task_points.get(task_name, 0)
         
-        points_earned = task_points.get(task_name, 0)
+        c.execute('SELECT completed FROM user_tasks WHERE wallet_address = ? AND task_name = ?',
+                  (wallet_address, task_name))
+        previous = c.fetchone()
         
         if proof_data:
             c.execute('''
@@ -216,12 +1235,23 @@ def complete_task(wallet_address, task_name, proof_data=None):
                 SET completed = TRUE, completed_at = CURRENT_TIMESTAMP
                 WHERE wallet_address = ? AND task_name = ?
             ''', (wallet_address, task_name))
+        task_updated = c.rowcount > 0
+        if task_updated and not previous[0]:
+            record_rollup(c, 'task_completions', task_name)
         
         # Add points to user
         c.execute('UPDATE users SET points = points + ? WHERE wallet_address = ?', (points_earned, wallet_address))
         
         conn.commit()
         success = c.rowcount > 0
+        current_campaign().replica.note_write()
+        
+        if success and task_updated:
+            publish_event('task_completed', {
+                'wallet_address': wallet_address,
+                'task_name': task_name,
+                'points_earned': points_earned
+            })
         
         # Update token earnings if task completed successfully
         if success:
@@ -229,12 +1259,12 @@ def complete_task(wallet_address, task_name, proof_data=None):
             
         conn.close()
         return success
-    except Exception as e:
-        print(f"Error completing task: {e}")
+    except Exception:
+        users_log.exception('Error completing task')
         return False
 
 def get_user_tasks(wallet_address):
-    conn = sqlite3.connect('airdrop.db')
+    conn = connect_db()
     c = conn.cursor()
     
     c.execute('''
@@ -262,14 +1292,36 @@ def is_valid_wallet_address(address):
         return False
     return True
 
+def to_checksum_address(address):
+    """EIP-55 checksum form of a 0x-prefixed hex address"""
+    body = address[2:].lower()
+    digest = keccak(body.encode('ascii')).hex()
+    return '0x' + ''.join(ch.upper() if int(nibble, 16) >= 8 else ch for ch, nibble in zip(body, digest))
+
+def canonicalize_wallet_address(address):
+    """Return the checksummed address, or None if it is malformed or fails its EIP-55 checksum"""
+    if not is_valid_wallet_address(address):
+        return None
+    
+    checksummed = to_checksum_address(address)
+    body = address[2:]
+    # All-lowercase / all-uppercase addresses carry no checksum
+    if body != body.lower() and body != body.upper() and address != checksummed:
+        return None
+    return checksummed
+
+def lookup_wallet_address(address):
+    """Normalize a wallet from a request so any casing finds the stored row"""
+    return canonicalize_wallet_address(address) or address
+
 # Token Distribution Functions
 def calculate_tokens_from_points(points):
     """Calculate tokens based on points"""
-    return points // TOKEN_CONFIG['points_to_tokens_ratio']
+    return points // current_campaign().token_config['points_to_tokens_ratio']
 
 def initialize_token_distribution(wallet_address):
     """Initialize token distribution for a user"""
-    conn = sqlite3.connect('airdrop.db')
+    conn = connect_db()
     c = conn.cursor()
     
     try:
@@ -279,15 +1331,15 @@ def initialize_token_distribution(wallet_address):
         ''', (wallet_address,))
         conn.commit()
         return True
-    except Exception as e:
-        print(f"Error initializing token distribution: {e}")
+    except Exception:
+        tokens_log.exception('Error initializing token distribution')
         return False
     finally:
         conn.close()
 
 def update_token_earnings(wallet_address):
     """Update token earnings based on current points"""
-    conn = sqlite3.connect('airdrop.db')
+    conn = connect_db()
     c = conn.cursor()
     
     try:
@@ -297,7 +1349,10 @@ def update_token_earnings(wallet_address):
         
         if result:
             points = result[0]
-            tokens_earned = calculate_tokens_from_points(points)
+            tokens_earned = calculate_tokens_from_points(points) if is_wallet_eligible(c, wallet_address) else 0
+            
+            c.execute('SELECT tokens_earned FROM token_distribution WHERE wallet_address = ?', (wallet_address,))
+            previous = c.fetchone()
             
             c.execute('''
                 UPDATE token_distribution 
@@ -306,26 +1361,38 @@ def update_token_earnings(wallet_address):
             ''', (tokens_earned, wallet_address))
             
             conn.commit()
+            
+            if previous and previous[0] != tokens_earned:
+                publish_event('tokens_earned', {
+                    'wallet_address': wallet_address,
+                    'tokens_earned': tokens_earned,
+                    'delta': tokens_earned - (previous[0] or 0)
+                })
             return tokens_earned
         return 0
-    except Exception as e:
-        print(f"Error updating token earnings: {e}")
+    except Exception:
+        tokens_log.exception('Error updating token earnings')
         return 0
     finally:
         conn.close()
 
 def simulate_token_distribution(wallet_address):
     """Simulate token distribution with fake transaction hash"""
-    conn = sqlite3.connect('airdrop.db')
+    conn = connect_db()
     c = conn.cursor()
     
     try:
         # Get tokens earned
-        c.execute('SELECT tokens_earned FROM token_distribution WHERE wallet_address = ?', (wallet_address,))
+        c.execute('''
+            SELECT tokens_earned, tokens_distributed, distribution_status
+            FROM token_distribution WHERE wallet_address = ?
+        ''', (wallet_address,))
         result = c.fetchone()
         
         if result and result[0] > 0:
-            tokens = result[0]
+            tokens, previously_distributed, previous_status = result
+            c.execute('SELECT points FROM users WHERE wallet_address = ?', (wallet_address,))
+            points_row = c.fetchone()
             
             # Generate fake transaction hash
             tx_data = f"{wallet_address}{tokens}{time.time()}"
@@ -339,27 +1406,38 @@ def simulate_token_distribution(wallet_address):
                     distribution_date = CURRENT_TIMESTAMP,
                     points_used = ?
                 WHERE wallet_address = ?
-            ''', (tokens, f"0x{fake_tx_hash}", tokens * TOKEN_CONFIG['points_to_tokens_ratio'], wallet_address))
+            ''', (tokens, f"0x{fake_tx_hash}", tokens * current_campaign().token_config['points_to_tokens_ratio'], wallet_address))
             
             conn.commit()
             
             # Reset user points after distribution
             c.execute('UPDATE users SET points = 0 WHERE wallet_address = ?', (wallet_address,))
             conn.commit()
+            current_campaign().replica.note_write()
+            
+            publish_event('distribution', {
+                'wallet_address': wallet_address,
+                'tokens': tokens,
+                'tokens_distributed_delta': tokens - (previously_distributed or 0),
+                'first_claim': previous_status != 'completed',
+                'points_reset': points_row[0] if points_row else 0,
+                'tx_hash': f"0x{fake_tx_hash}",
+                'distribution_date': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+            })
             
             return {
                 'success': True,
                 'tokens': tokens,
                 'tx_hash': f"0x{fake_tx_hash}",
-                'message': f'✅ {tokens} {TOKEN_CONFIG["token_symbol"]} tokens distributed successfully!'
+                'message': f'✅ {tokens} {current_campaign().token_config["token_symbol"]} tokens distributed successfully!'
             }
         else:
             return {
                 'success': False,
                 'message': 'No tokens available for distribution'
             }
-    except Exception as e:
-        print(f"Error simulating token distribution: {e}")
+    except Exception:
+        tokens_log.exception('Error simulating token distribution')
         return {
             'success': False,
             'message': 'Distribution failed'
@@ -396,105 +1474,386 @@ def get_twitter_bearer_token():
             token_data = response.json()
             return token_data.get('access_token')
         else:
-            print(f"❌ Failed to get Bearer token: {response.status_code}")
+            twitter_log.error('Failed to get bearer token', extra={'status_code': response.status_code})
             return None
             
-    except Exception as e:
-        print(f"❌ Error getting Bearer token: {e}")
+    except Exception:
+        twitter_log.exception('Error getting bearer token')
         return None
 
-def verify_twitter_follow(twitter_handle):
-    """Verify if user follows our project on Twitter using real API"""
-    # Use provided Bearer token or generate one
-    bearer_token = TWITTER_BEARER_TOKEN
-    if not bearer_token and TWITTER_API_KEY and TWITTER_API_SECRET:
-        bearer_token = get_twitter_bearer_token()
+# Shared async Twitter client. One event loop per worker owns the httpx
+# connection pool; async views hand their coroutines to it, so every
+# request reuses the same keep-alive connections.
+TWITTER_API_BASE = os.getenv('TWITTER_API_BASE', 'https://api.twitter.com').rstrip('/')
+TWITTER_HTTP_TIMEOUT = 10
+
+_twitter_loop = None
+_twitter_loop_pid = None
+_twitter_loop_lock = threading.Lock()
+_twitter_client = None
+_twitter_cache = {'bearer_token': None, 'project_id': None}
+
+def get_twitter_loop():
+    """Start the background loop that owns the Twitter HTTP client (once per worker)"""
+    global _twitter_loop, _twitter_loop_pid, _twitter_client
+    with _twitter_loop_lock:
+        if _twitter_loop is None or _twitter_loop_pid != os.getpid():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='twitter-http', daemon=True).start()
+            _twitter_loop = loop
+            _twitter_loop_pid = os.getpid()
+            _twitter_client = None
+    return _twitter_loop
+
+def get_twitter_http_client():
+    """Shared AsyncClient; only called from coroutines running on the Twitter loop"""
+    global _twitter_client
+    if _twitter_client is None:
+        _twitter_client = httpx.AsyncClient(
+            base_url=TWITTER_API_BASE,
+            timeout=TWITTER_HTTP_TIMEOUT,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return _twitter_client
+
+async def run_twitter_calls(*coros):
+    """Run Twitter coroutines concurrently on the shared loop and await their results"""
+    context = log_context.get()
     
-    if not bearer_token or not TWITTER_USERNAME:
-        print("🐦 Twitter API not configured - using simulation")
-        return True, f"simulated_{twitter_handle}_id"
+    async def gather():
+        log_context.set(context)
+        return await asyncio.gather(*coros)
+    
+    future = asyncio.run_coroutine_threadsafe(gather(), get_twitter_loop())
+    return await asyncio.wrap_future(future)
+
+def run_twitter_call_sync(coro):
+    """Blocking entry point for non-async callers"""
+    context = log_context.get()
+    
+    async def run():
+        log_context.set(context)
+        return await coro
+    
+    return asyncio.run_coroutine_threadsafe(run(), get_twitter_loop()).result()
+
+# Shared Twitter rate-limit budget. Every worker on the host draws from the
+# same per-endpoint token bucket stored in a small SQLite file, and the
+# bucket is resynced from the x-rate-limit-* headers Twitter returns.
+TWITTER_RATE_LIMIT_DB = os.getenv('TWITTER_RATE_LIMIT_DB', 'twitter_rate_limits.db')
+TWITTER_RATE_LIMIT_MAX_WAIT = float(os.getenv('TWITTER_RATE_LIMIT_MAX_WAIT', '5'))
+TWITTER_RATE_LIMIT_RESET_SLACK = 1  # seconds added to x-rate-limit-reset for clock skew
+TWITTER_RATE_LIMITS = {
+    # endpoint: (requests per window, window in seconds) - app-auth defaults
+    'users_by_username': (300, 900),
+    'users_following': (15, 900),
+    'users_tweets': (1500, 900)
+}
+
+class TwitterRateLimited(Exception):
+    """Raised when an endpoint's shared budget will not refill within TWITTER_RATE_LIMIT_MAX_WAIT"""
+
+    def __init__(self, endpoint, retry_after):
+        super().__init__(f"Twitter {endpoint} budget exhausted, retry in {retry_after}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+def connect_twitter_rate_limits():
+    return sqlite3.connect(TWITTER_RATE_LIMIT_DB, timeout=10, isolation_level=None)
+
+def init_twitter_rate_limits():
+    conn = connect_twitter_rate_limits()
+    c = conn.cursor()
+    
+    c.execute('PRAGMA journal_mode=WAL')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS twitter_rate_limits (
+            endpoint TEXT PRIMARY KEY,
+            capacity INTEGER NOT NULL,
+            window_seconds INTEGER NOT NULL,
+            tokens REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            reset_at REAL
+        )
+    ''')
+    
+    now = time.time()
+    c.executemany('''
+        INSERT OR IGNORE INTO twitter_rate_limits (endpoint, capacity, window_seconds, tokens, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [(endpoint, limit, window, limit, now) for endpoint, (limit, window) in TWITTER_RATE_LIMITS.items()])
+    
+    conn.close()
+
+def acquire_twitter_budget(endpoint):
+    """Take one request from the shared bucket; returns 0 if admitted, else seconds to wait"""
+    conn = connect_twitter_rate_limits()
+    c = conn.cursor()
     
     try:
-        headers = {
-            'Authorization': f'Bearer {bearer_token}'
+        c.execute('BEGIN IMMEDIATE')
+        c.execute('''
+            SELECT capacity, window_seconds, tokens, updated_at, reset_at
+            FROM twitter_rate_limits WHERE endpoint = ?
+        ''', (endpoint,))
+        row = c.fetchone()
+        
+        if not row:
+            c.execute('ROLLBACK')
+            return 0
+        
+        capacity, window_seconds, tokens, updated_at, reset_at = row
+        now = time.time()
+        rate = capacity / window_seconds
+        
+        if reset_at is not None:
+            # Twitter told us when its window resets - hold until then
+            if now >= reset_at:
+                tokens, reset_at = capacity, None
+        else:
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+        
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0
+        elif reset_at is not None:
+            wait = reset_at - now
+        else:
+            wait = (1 - tokens) / rate
+        
+        c.execute('''
+            UPDATE twitter_rate_limits SET tokens = ?, updated_at = ?, reset_at = ?
+            WHERE endpoint = ?
+        ''', (tokens, now, reset_at, endpoint))
+        c.execute('COMMIT')
+        return wait
+    finally:
+        conn.close()
+
+def sync_twitter_budget(endpoint, headers, status_code):
+    """Resync the shared bucket from Twitter's x-rate-limit-* response headers"""
+    remaining = headers.get('x-rate-limit-remaining')
+    if remaining is None and status_code != 429:
+        return
+    
+    limit = headers.get('x-rate-limit-limit')
+    reset = headers.get('x-rate-limit-reset')
+    
+    conn = connect_twitter_rate_limits()
+    c = conn.cursor()
+    
+    try:
+        reported = 0 if status_code == 429 else int(remaining)
+        reported_reset = float(reset) + TWITTER_RATE_LIMIT_RESET_SLACK if reset else None
+        
+        c.execute('BEGIN IMMEDIATE')
+        c.execute('SELECT tokens, reset_at FROM twitter_rate_limits WHERE endpoint = ?', (endpoint,))
+        row = c.fetchone()
+        if not row:
+            c.execute('ROLLBACK')
+            return
+        
+        tokens, reset_at = row
+        if reported_reset is not None and reset_at is not None and reported_reset > reset_at:
+            # Twitter has started a new window since we last heard
+            tokens, reset_at = reported, reported_reset
+        elif reported_reset is not None and reset_at is not None and reported_reset < reset_at:
+            # Late response from an older window - nothing to learn from it
+            pass
+        else:
+            # Same window (or first sync): other workers may hold tokens for
+            # requests still in flight, so never raise the local count
+            tokens = min(tokens, reported)
+            reset_at = reported_reset or reset_at
+        
+        c.execute('''
+            UPDATE twitter_rate_limits
+            SET tokens = ?, updated_at = ?, reset_at = ?, capacity = COALESCE(?, capacity)
+            WHERE endpoint = ?
+        ''', (tokens, time.time(), reset_at, int(limit) if limit else None, endpoint))
+        c.execute('COMMIT')
+    except ValueError:
+        twitter_log.warning('Ignoring malformed rate-limit headers', extra={'endpoint': endpoint})
+    finally:
+        conn.close()
+
+def get_twitter_budget_snapshot():
+    conn = connect_twitter_rate_limits()
+    c = conn.cursor()
+    c.execute('SELECT endpoint, capacity, tokens, reset_at FROM twitter_rate_limits')
+    rows = c.fetchall()
+    conn.close()
+    
+    return {
+        endpoint: {
+            'capacity': capacity,
+            'remaining': int(tokens),
+            'reset_at': datetime.utcfromtimestamp(reset_at).isoformat() if reset_at else None
         }
+        for endpoint, capacity, tokens, reset_at in rows
+    }
+
+async def twitter_api_get(endpoint, path, **kwargs):
+    """GET a Twitter API path once the shared budget for endpoint admits it"""
+    deadline = time.time() + TWITTER_RATE_LIMIT_MAX_WAIT
+    
+    while True:
+        wait = await asyncio.to_thread(acquire_twitter_budget, endpoint)
+        if wait <= 0:
+            break
+        if time.time() + wait > deadline:
+            raise TwitterRateLimited(endpoint, int(wait) + 1)
+        await asyncio.sleep(wait)
+    
+    response = await get_twitter_http_client().get(path, **kwargs)
+    await asyncio.to_thread(sync_twitter_budget, endpoint, response.headers, response.status_code)
+    if response.status_code == 429:
+        reset = response.headers.get('x-rate-limit-reset')
+        retry_after = int(float(reset) - time.time()) + TWITTER_RATE_LIMIT_RESET_SLACK if reset else 60
+        raise TwitterRateLimited(endpoint, max(retry_after, 1))
+    return response
+
+init_twitter_rate_limits()
+
+async def get_twitter_bearer_token_async():
+    """Get Bearer token, exchanging API key and secret once per worker"""
+    if TWITTER_BEARER_TOKEN:
+        return TWITTER_BEARER_TOKEN
+    if not TWITTER_API_KEY or not TWITTER_API_SECRET:
+        return None
+    if _twitter_cache['bearer_token']:
+        return _twitter_cache['bearer_token']
+    
+    try:
+        credentials = base64.b64encode(f"{TWITTER_API_KEY}:{TWITTER_API_SECRET}".encode()).decode()
         
-        # Get our project's Twitter ID
-        project_url = f'https://api.twitter.com/2/users/by/username/{TWITTER_USERNAME}'
-        project_response = requests.get(project_url, headers=headers)
+        response = await get_twitter_http_client().post(
+            '/oauth2/token',
+            headers={
+                'Authorization': f'Basic {credentials}',
+                'Content-Type': 'application/x-www-form-urlencoded;charset=UTF-8'
+            },
+            data={'grant_type': 'client_credentials'}
+        )
         
-        if project_response.status_code != 200:
-            print(f"❌ Could not find project Twitter account: {TWITTER_USERNAME}")
-            return False, None
+        if response.status_code == 200:
+            _twitter_cache['bearer_token'] = response.json().get('access_token')
+            return _twitter_cache['bearer_token']
+        else:
+            twitter_log.error('Failed to get bearer token', extra={'status_code': response.status_code})
+            return None
             
-        project_data = project_response.json()
-        project_id = project_data['data']['id']
-        print(f"✅ Found project ID: {project_id} for @{TWITTER_USERNAME}")
+    except Exception:
+        twitter_log.exception('Error getting bearer token')
+        return None
+
+async def get_twitter_project_id_async(headers):
+    """Look up (and cache) our project's Twitter ID"""
+    if _twitter_cache['project_id']:
+        return _twitter_cache['project_id']
+    
+    response = await twitter_api_get('users_by_username', f'/2/users/by/username/{TWITTER_USERNAME}', headers=headers)
+    if response.status_code != 200:
+        twitter_log.error('Could not find project Twitter account', extra={'twitter_username': TWITTER_USERNAME})
+        return None
+    
+    _twitter_cache['project_id'] = response.json()['data']['id']
+    twitter_log.info('Found project ID', extra={'project_id': _twitter_cache['project_id'], 'twitter_username': TWITTER_USERNAME})
+    return _twitter_cache['project_id']
+
+TWITTER_USER_FIELDS = 'created_at,public_metrics,verified,description'
+
+async def lookup_twitter_user_async(twitter_handle, headers):
+    """One users/by/username call with profile fields; the ID and metrics both come from it"""
+    response = await twitter_api_get('users_by_username', f'/2/users/by/username/{twitter_handle}', headers=headers,
+                                     params={'user.fields': TWITTER_USER_FIELDS})
+    if response.status_code != 200:
+        return None
+    return response.json().get('data')
+
+async def verify_twitter_follow_async(twitter_handle):
+    """Verify if user follows our project on Twitter using real API.
+
+    Returns (follows_project, twitter_id, user_info).
+    """
+    bearer_token = await get_twitter_bearer_token_async()
+    
+    if not bearer_token or not TWITTER_USERNAME:
+        twitter_log.debug('Twitter API not configured - simulating follow verification')
+        return True, f"simulated_{twitter_handle}_id", None
+    
+    try:
+        headers = {
+            'Authorization': f'Bearer {bearer_token}'
+        }
+        # Project and user lookups are independent - issue them together
+        project_id, user_info = await asyncio.gather(
+            get_twitter_project_id_async(headers),
+            lookup_twitter_user_async(twitter_handle, headers)
+        )
         
-        # Get user's Twitter ID
-        user_url = f'https://api.twitter.com/2/users/by/username/{twitter_handle}'
-        user_response = requests.get(user_url, headers=headers)
+        if not project_id:
+            return False, None, user_info
         
-        if user_response.status_code != 200:
-            print(f"❌ Could not find user: {twitter_handle}")
-            return False, None
+        if not user_info:
+            twitter_log.info('Could not find Twitter user', extra={'twitter_handle': twitter_handle})
+            return False, None, None
             
-        user_data = user_response.json()
-        user_id = user_data['data']['id']
-        print(f"✅ Found user ID: {user_id} for @{twitter_handle}")
+        user_id = user_info['id']
+        twitter_log.debug('Found Twitter user', extra={'twitter_handle': twitter_handle, 'twitter_id': user_id})
         
         # Check if user follows our project
-        following_url = f'https://api.twitter.com/2/users/{user_id}/following'
-        following_response = requests.get(following_url, headers=headers, 
-                                        params={'max_results': 1000})
+        following_response = await twitter_api_get('users_following', f'/2/users/{user_id}/following',
+                                                   headers=headers, params={'max_results': 1000})
         
         if following_response.status_code == 200:
             following_data = following_response.json()
             if 'data' in following_data:
                 for followed_user in following_data['data']:
                     if followed_user['id'] == project_id:
-                        print(f"✅ User @{twitter_handle} follows @{TWITTER_USERNAME}")
-                        return True, user_id
+                        twitter_log.debug('Follow confirmed', extra={'twitter_handle': twitter_handle})
+                        return True, user_id, user_info
             
-            print(f"❌ User @{twitter_handle} does not follow @{TWITTER_USERNAME}")
-            return False, user_id
+            twitter_log.debug('Follow not found', extra={'twitter_handle': twitter_handle})
+            return False, user_id, user_info
         else:
-            print(f"❌ Error checking follows: {following_response.status_code}")
-            return False, user_id
+            twitter_log.error('Error checking follows', extra={'status_code': following_response.status_code})
+            return False, user_id, user_info
         
-    except Exception as e:
-        print(f"❌ Twitter API Error: {e}")
-        return False, None
+    except TwitterRateLimited:
+        raise
+    except Exception:
+        twitter_log.exception('Twitter API error')
+        return False, None, None
+
+def verify_twitter_follow(twitter_handle):
+    """Blocking wrapper around verify_twitter_follow_async; returns (follows_project, twitter_id)"""
+    follows_project, twitter_id, _ = run_twitter_call_sync(verify_twitter_follow_async(twitter_handle))
+    return follows_project, twitter_id
 
-def verify_twitter_retweet(twitter_handle, tweet_id):
-    """Verify if user retweeted specific tweet"""
-    bearer_token = TWITTER_BEARER_TOKEN
-    if not bearer_token and TWITTER_API_KEY and TWITTER_API_SECRET:
-        bearer_token = get_twitter_bearer_token()
+async def verify_twitter_retweet_async(twitter_handle, tweet_id):
+    """Verify if user retweeted specific tweet; returns (retweeted, user_info)"""
+    bearer_token = await get_twitter_bearer_token_async()
     
     if not bearer_token:
-        print("🐦 Twitter API not configured - simulating retweet verification")
-        return True
+        twitter_log.debug('Twitter API not configured - simulating retweet verification')
+        return True, None
     
     try:
         headers = {
             'Authorization': f'Bearer {bearer_token}'
         }
-        
         # Get user ID
-        user_url = f'https://api.twitter.com/2/users/by/username/{twitter_handle}'
-        user_response = requests.get(user_url, headers=headers)
+        user_info = await lookup_twitter_user_async(twitter_handle, headers)
         
-        if user_response.status_code != 200:
-            return False
+        if not user_info:
+            return False, None
             
-        user_data = user_response.json()
-        user_id = user_data['data']['id']
+        user_id = user_info['id']
         
         # Check user's retweets (this endpoint might need additional permissions)
-        retweets_url = f'https://api.twitter.com/2/users/{user_id}/tweets'
-        retweets_response = requests.get(retweets_url, headers=headers, 
-                                       params={'max_results': 100, 'exclude': 'replies'})
+        retweets_response = await twitter_api_get('users_tweets', f'/2/users/{user_id}/tweets', headers=headers,
+                                                  params={'max_results': 100, 'exclude': 'replies'})
         
         if retweets_response.status_code == 200:
             tweets_data = retweets_response.json()
@@ -502,17 +1861,24 @@ def verify_twitter_retweet(twitter_handle, tweet_id):
                 for tweet in tweets_data['data']:
                     # Check if this is a retweet of our tweet
                     if 'retweeted_status' in tweet and tweet['retweeted_status']['id'] == tweet_id:
-                        return True
+                        return True, user_info
         
-        return False
+        return False, user_info
         
-    except Exception as e:
-        print(f"❌ Twitter Retweet Error: {e}")
-        return False
+    except TwitterRateLimited:
+        raise
+    except Exception:
+        twitter_log.exception('Twitter retweet check error')
+        return False, None
+
+def verify_twitter_retweet(twitter_handle, tweet_id):
+    """Blocking wrapper around verify_twitter_retweet_async"""
+    retweeted, _ = run_twitter_call_sync(verify_twitter_retweet_async(twitter_handle, tweet_id))
+    return retweeted
 
 def save_twitter_verification(wallet_address, twitter_handle, twitter_id, follows_project=False, retweeted=False):
     """Save Twitter verification data"""
-    conn = sqlite3.connect('airdrop.db')
+    conn = connect_db()
     c = conn.cursor()
     
     try:
@@ -530,18 +1896,17 @@ def save_twitter_verification(wallet_address, twitter_handle, twitter_id, follow
         ''', (twitter_handle, twitter_id, wallet_address))
         
         conn.commit()
+        current_campaign().replica.note_write()
         return True
-    except Exception as e:
-        print(f"❌ Save Twitter Verification Error: {e}")
+    except Exception:
+        twitter_log.exception('Error saving Twitter verification')
         return False
     finally:
         conn.close()
 
-def get_twitter_user_info(twitter_handle):
+async def get_twitter_user_info_async(twitter_handle):
     """Get Twitter user public information"""
-    bearer_token = TWITTER_BEARER_TOKEN
-    if not bearer_token and TWITTER_API_KEY and TWITTER_API_SECRET:
-        bearer_token = get_twitter_bearer_token()
+    bearer_token = await get_twitter_bearer_token_async()
     
     if not bearer_token:
         return None
@@ -551,25 +1916,329 @@ def get_twitter_user_info(twitter_handle):
             'Authorization': f'Bearer {bearer_token}'
         }
         
-        url = f'https://api.twitter.com/2/users/by/username/{twitter_handle}'
-        response = requests.get(url, headers=headers, 
-                              params={'user.fields': 'created_at,public_metrics,verified,description'})
+        return await lookup_twitter_user_async(twitter_handle, headers)
         
-        if response.status_code == 200:
-            return response.json()['data']
+    except TwitterRateLimited:
+        raise
+    except Exception:
+        twitter_log.exception('Twitter user info error')
         return None
-        
-    except Exception as e:
-        print(f"❌ Twitter User Info Error: {e}")
+
+def get_twitter_user_info(twitter_handle):
+    """Blocking wrapper around get_twitter_user_info_async"""
+    return run_twitter_call_sync(get_twitter_user_info_async(twitter_handle))
+
+# Telegram membership sync. A bot consumer (webhook or `flask --app app
+# telegram-sync` long polling) mirrors join/leave events into
+# telegram_members, so checking join_telegram is a local lookup instead of
+# a getChatMember call per click. Wallets are linked to Telegram accounts
+# with a one-time code sent to the bot as /start <code>. There is one bot
+# and one chat for every campaign, so this state lives in its own shared
+# SQLite file and links are keyed by (campaign, wallet).
+TELEGRAM_DB = os.getenv('TELEGRAM_DB', 'telegram.db')
+TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
+TELEGRAM_BOT_USERNAME = os.getenv('TELEGRAM_BOT_USERNAME', '').replace('@', '').strip()
+TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID', '').strip()
+TELEGRAM_API_BASE = os.getenv('TELEGRAM_API_BASE', 'https://api.telegram.org').rstrip('/')
+TELEGRAM_WEBHOOK_SECRET = os.getenv('TELEGRAM_WEBHOOK_SECRET')
+TELEGRAM_LINK_CODE_TTL = 900
+TELEGRAM_POLL_TIMEOUT = 30
+TELEGRAM_ALLOWED_UPDATES = ['message', 'chat_member']
+TELEGRAM_MEMBER_STATUSES = ('creator', 'administrator', 'member')
+
+telegram_log = logging.getLogger('airdrop.telegram')
+
+def telegram_api_url(method):
+    return f'{TELEGRAM_API_BASE}/bot{TELEGRAM_BOT_TOKEN}/{method}'
+
+def connect_telegram():
+    return sqlite3.connect(TELEGRAM_DB, timeout=10, isolation_level=None)
+
+def init_telegram():
+    conn = connect_telegram()
+    c = conn.cursor()
+    
+    c.execute('PRAGMA journal_mode=WAL')
+    # Chat membership mirrored from bot updates, wallet links and one-time link codes
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS telegram_members (
+            chat_id INTEGER NOT NULL,
+            telegram_user_id INTEGER NOT NULL,
+            username TEXT,
+            is_member BOOLEAN NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (chat_id, telegram_user_id)
+        ) WITHOUT ROWID
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS telegram_links (
+            campaign TEXT NOT NULL,
+            wallet_address TEXT NOT NULL,
+            telegram_user_id INTEGER NOT NULL,
+            telegram_username TEXT,
+            linked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (campaign, wallet_address)
+        )
+    ''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_telegram_links_user ON telegram_links (telegram_user_id)')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS telegram_link_codes (
+            code TEXT PRIMARY KEY,
+            campaign TEXT NOT NULL,
+            wallet_address TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+    ''')
+    c.execute('CREATE TABLE IF NOT EXISTS telegram_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+    conn.close()
+
+init_telegram()
+
+def create_telegram_link_code(wallet_address):
+    """Issue a one-time code that links wallet_address in the current campaign to whoever sends it to the bot"""
+    code = secrets.token_urlsafe(12)
+    campaign_slug = current_campaign().slug
+    conn = connect_telegram()
+    try:
+        c = conn.cursor()
+        c.execute('BEGIN IMMEDIATE')
+        c.execute('DELETE FROM telegram_link_codes WHERE (campaign = ? AND wallet_address = ?) OR expires_at < ?',
+                  (campaign_slug, wallet_address, time.time()))
+        c.execute('INSERT INTO telegram_link_codes (code, campaign, wallet_address, expires_at) VALUES (?, ?, ?, ?)',
+                  (code, campaign_slug, wallet_address, time.time() + TELEGRAM_LINK_CODE_TTL))
+        c.execute('COMMIT')
+    finally:
+        conn.close()
+    return code
+
+def is_telegram_member(wallet_address):
+    """Whether the Telegram account linked to wallet_address is currently in the project chat"""
+    conn = connect_telegram()
+    try:
+        c = conn.cursor()
+        c.execute('''
+            SELECT 1 FROM telegram_links l
+            JOIN telegram_members m ON m.telegram_user_id = l.telegram_user_id
+            WHERE l.campaign = ? AND l.wallet_address = ? AND m.chat_id = ? AND m.is_member
+        ''', (current_campaign().slug, wallet_address, int(TELEGRAM_CHAT_ID)))
+        return c.fetchone() is not None
+    finally:
+        conn.close()
+
+def is_telegram_linked(wallet_address):
+    conn = connect_telegram()
+    try:
+        c = conn.cursor()
+        c.execute('SELECT 1 FROM telegram_links WHERE campaign = ? AND wallet_address = ?',
+                  (current_campaign().slug, wallet_address))
+        return c.fetchone() is not None
+    finally:
+        conn.close()
+
+def record_telegram_member(c, chat_id, user, is_member):
+    c.execute('''
+        INSERT INTO telegram_members (chat_id, telegram_user_id, username, is_member, updated_at)
+        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT (chat_id, telegram_user_id) DO UPDATE SET
+            username = COALESCE(excluded.username, username), is_member = excluded.is_member,
+            updated_at = CURRENT_TIMESTAMP
+    ''', (chat_id, user['id'], user.get('username'), is_member))
+
+def link_telegram_account(c, code, user):
+    """Consume a link code; returns (campaign, wallet), or None for an unknown or expired code"""
+    c.execute('SELECT campaign, wallet_address, expires_at FROM telegram_link_codes WHERE code = ?', (code,))
+    row = c.fetchone()
+    if not row:
+        return None
+    c.execute('DELETE FROM telegram_link_codes WHERE code = ?', (code,))
+    campaign_slug, wallet_address, expires_at = row
+    if expires_at < time.time():
         return None
+    
+    # Per campaign: one Telegram account per wallet and one wallet per Telegram account
+    c.execute('DELETE FROM telegram_links WHERE campaign = ? AND telegram_user_id = ?', (campaign_slug, user['id']))
+    c.execute('''
+        INSERT OR REPLACE INTO telegram_links (campaign, wallet_address, telegram_user_id, telegram_username)
+        VALUES (?, ?, ?, ?)
+    ''', (campaign_slug, wallet_address, user['id'], user.get('username')))
+    return campaign_slug, wallet_address
+
+def apply_telegram_update(c, update):
+    """Apply one Bot API update (link command, join or leave) inside the caller's transaction"""
+    if 'chat_member' in update:
+        member = update['chat_member']
+        new = member['new_chat_member']
+        is_member = new['status'] in TELEGRAM_MEMBER_STATUSES or (new['status'] == 'restricted' and new.get('is_member'))
+        if not TELEGRAM_CHAT_ID or str(member['chat']['id']) == TELEGRAM_CHAT_ID:
+            record_telegram_member(c, member['chat']['id'], new['user'], bool(is_member))
+        return
+    
+    message = update.get('message')
+    if not message:
+        return
+    chat = message['chat']
+    
+    if chat['type'] == 'private':
+        command, _, code = (message.get('text') or '').partition(' ')
+        if command.split('@')[0] in ('/start', '/link') and code.strip():
+            linked = link_telegram_account(c, code.strip(), message['from'])
+            campaign_slug, wallet_address = linked or (None, None)
+            telegram_log.info('Telegram link ' + ('completed' if linked else 'rejected'),
+                              extra={'telegram_user_id': message['from']['id'], 'campaign': campaign_slug,
+                                     'wallet_address': wallet_address})
+        return
+    
+    if TELEGRAM_CHAT_ID and str(chat['id']) != TELEGRAM_CHAT_ID:
+        return
+    for user in message.get('new_chat_members', []):
+        record_telegram_member(c, chat['id'], user, True)
+    if 'left_chat_member' in message:
+        record_telegram_member(c, chat['id'], message['left_chat_member'], False)
+
+def apply_telegram_updates(conn, updates, offset_key=None):
+    """Apply a batch of updates in one transaction, storing the polling offset with them.
+
+    An update that does not have the shape we expect is logged and skipped
+    (its partial writes rolled back) so it cannot wedge the feed.
+    """
+    c = conn.cursor()
+    c.execute('BEGIN IMMEDIATE')
+    try:
+        applied = 0
+        for update in updates:
+            c.execute('SAVEPOINT telegram_update')
+            try:
+                apply_telegram_update(c, update)
+                applied += 1
+            except (KeyError, TypeError, ValueError, AttributeError):
+                c.execute('ROLLBACK TO telegram_update')
+                telegram_log.warning('Skipping malformed Telegram update', exc_info=True,
+                                     extra={'update_id': update.get('update_id') if isinstance(update, dict) else None})
+            c.execute('RELEASE telegram_update')
+        if offset_key and updates:
+            c.execute('INSERT OR REPLACE INTO telegram_state (key, value) VALUES (?, ?)',
+                      (offset_key, str(updates[-1]['update_id'] + 1)))
+        c.execute('COMMIT')
+        return applied
+    except Exception:
+        c.execute('ROLLBACK')
+        raise
+
+# Static asset pipeline: `flask --app app build-static` writes content-hashed
+# copies (plus .gz/.br variants) to static/dist and a manifest that url_for uses
+STATIC_DIST_DIR = 'dist'
+STATIC_FINGERPRINT_EXTENSIONS = ('.css', '.js')
+STATIC_ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+STATIC_IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+
+def load_static_manifest():
+    try:
+        with open(os.path.join(app.static_folder, STATIC_DIST_DIR, 'manifest.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+static_manifest = load_static_manifest()
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint, values):
+    """Point url_for('static', ...) at the fingerprinted build when there is one"""
+    if endpoint == 'static' and values.get('filename') in static_manifest:
+        values['filename'] = static_manifest[values['filename']]
+
+def serve_static(filename):
+    """Serve fingerprinted assets precompressed with immutable caching"""
+    if not filename.startswith(f'{STATIC_DIST_DIR}/'):
+        return app.send_static_file(filename)
+    
+    mimetype = mimetypes.guess_type(filename)[0]
+    response = None
+    for encoding, suffix in STATIC_ENCODINGS:
+        if request.accept_encodings[encoding] and os.path.isfile(safe_join(app.static_folder, filename + suffix) or ''):
+            response = send_from_directory(app.static_folder, filename + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            break
+    if response is None:
+        response = send_from_directory(app.static_folder, filename, mimetype=mimetype)
+    
+    response.headers['Cache-Control'] = STATIC_IMMUTABLE_CACHE
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+app.view_functions['static'] = serve_static
+
+def require_admin_token(view):
+    """Allow the request only with ADMIN_API_TOKEN as a bearer token or ?token="""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_API_TOKEN:
+            return jsonify({'success': False, 'message': 'Admin API not configured'}), 403
+        
+        supplied = request.headers.get('Authorization', '').replace('Bearer ', '', 1) or request.args.get('token', '')
+        if not secrets.compare_digest(supplied, ADMIN_API_TOKEN):
+            return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.url_value_preprocessor
+def pull_campaign(endpoint, values):
+    """Resolve /c/<campaign>/... to its campaign; unprefixed routes use the default one"""
+    if values and 'campaign' in values:
+        g.campaign = get_campaign(values.pop('campaign'))
+
+@app.url_defaults
+def add_campaign(endpoint, values):
+    """Keep url_for() links inside the campaign being served"""
+    if 'campaign' in values or not app.url_map.is_endpoint_expecting(endpoint, 'campaign'):
+        return
+    campaign = current_campaign()
+    if campaign.slug != DEFAULT_CAMPAIGN:
+        values['campaign'] = campaign.slug
+
+@app.context_processor
+def inject_campaign():
+    campaign = current_campaign()
+    return {'campaign': campaign, 'campaign_base': campaign.url_prefix}
+
+@app.before_request
+def bind_log_context():
+    """Tag this request's log records with a request ID, its route and campaign"""
+    request_id = request.headers.get('X-Request-ID', '')[:64] or secrets.token_hex(8)
+    g.log_context_token = log_context.set({
+        'request_id': request_id,
+        'route': request.url_rule.rule if request.url_rule else None,
+        'method': request.method,
+        'campaign': current_campaign().slug
+    })
+
+@app.after_request
+def add_request_id_header(response):
+    context = log_context.get()
+    if context:
+        response.headers['X-Request-ID'] = context['request_id']
+    return response
+
+@app.teardown_request
+def unbind_log_context(exc):
+    token = g.pop('log_context_token', None)
+    if token is not None:
+        log_context.reset(token)
+
+def campaign_route(rule, **options):
+    """Register a route at rule for the default campaign and under /c/<campaign> for the others"""
+    def decorator(view):
+        app.route(rule, **options)(view)
+        app.route(f'/c/<campaign>{rule}', **options)(view)
+        return view
+    return decorator
 
 # Routes
-@app.route('/')
+@campaign_route('/')
 def index():
     referral_code = request.args.get('ref', '')
     return render_template('index.html', referral_code=referral_code)
 
-@app.route('/join-airdrop', methods=['POST'])
+@campaign_route('/join-airdrop', methods=['POST'])
 def join_airdrop():
     try:
         data = request.get_json()
@@ -581,7 +2250,7 @@ def join_airdrop():
         twitter_handle = data.get('twitter_handle', '').strip()
         referral_code = data.get('referral_code', '').strip()
         
-        print(f"📨 Received: {wallet_address}")
+        web_log.debug('Registration received', extra={'wallet_address': wallet_address})
         
         if not wallet_address:
             return jsonify({'success': False, 'message': 'Wallet address is required'})
@@ -589,28 +2258,47 @@ def join_airdrop():
         if not is_valid_wallet_address(wallet_address):
             return jsonify({'success': False, 'message': 'Invalid wallet address. Must start with 0x and be 42 characters.'})
         
+        wallet_address = canonicalize_wallet_address(wallet_address)
+        if not wallet_address:
+            return jsonify({'success': False, 'message': 'Invalid wallet address checksum. Please check the address and try again.'})
+        
         success, user_referral_code = add_user(wallet_address, email, twitter_handle, referral_code)
         
         if success:
             initialize_user_tasks(wallet_address)
             complete_task(wallet_address, 'join_airdrop')
             initialize_token_distribution(wallet_address)  # Initialize token distribution
-            print(f"✅ User registered: {wallet_address}")
+            web_log.info('User registered', extra={'wallet_address': wallet_address})
             return jsonify({
                 'success': True, 
                 'message': 'Successfully joined airdrop! Redirecting to tasks...',
+                'wallet_address': wallet_address,
                 'referral_code': user_referral_code
             })
         else:
             return jsonify({'success': False, 'message': 'Wallet already registered'})
             
-    except Exception as e:
-        print(f"❌ Error in join_airdrop: {e}")
+    except Exception:
+        web_log.exception('Error in join_airdrop')
         return jsonify({'success': False, 'message': 'Server error. Please try again.'})
 
-@app.route('/dashboard')
+def resync_max_age():
+    """Replica age a dashboard reload with ?resync=<since> accepts.
+
+    The event replay could not cover the snapshot taken at <since>, so the
+    replica is copied again only if it is no newer than that, and never more
+    often than REPLICA_MIN_REFRESH_SECONDS however many pages ask at once.
+    """
+    since = request.args.get('resync', type=float)
+    if since is None:
+        return None
+    return max(time.time() - since, REPLICA_MIN_REFRESH_SECONDS)
+
+@campaign_route('/dashboard')
 def dashboard():
-    conn = sqlite3.connect('airdrop.db')
+    campaign = current_campaign()
+    conn = campaign.replica.connect(max_age=resync_max_age())
+    replica_status = campaign.replica.status(conn)
     c = conn.cursor()
     c.execute('SELECT COUNT(*) FROM users')
     user_count = c.fetchone()[0]
@@ -632,26 +2320,27 @@ def dashboard():
             .stat-number {{ font-size: 2rem; font-weight: bold; color: #667eea; }}
         </style>
     </head>
-    <body>
+    <body data-base="{campaign.url_prefix}" data-since="{replica_status['snapshot_at'] or ''}">
         <div class="container">
-            <h1>🚀 Airdrop Dashboard</h1>
+            <h1>🚀 {campaign.name} Dashboard</h1>
+            <p style="color: #666;">📸 Data as of {replica_status['refreshed_at']} UTC ({replica_status['staleness_seconds']}s old) - live updates below</p>
             
             <div class="stats">
                 <div class="stat-card">
-                    <div class="stat-number">{user_count}</div>
+                    <div class="stat-number" id="userCount">{user_count}</div>
                     <div>Total Users</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-number">{sum(user[2] for user in users)}</div>
+                    <div class="stat-number" id="totalPoints">{sum(user[2] for user in users)}</div>
                     <div>Total Points</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-number">{len([u for u in users if u[1]])}</div>
+                    <div class="stat-number" id="twitterConnected">{len([u for u in users if u[1]])}</div>
                     <div>Twitter Connected</div>
                 </div>
                 <div class="stat-card">
                     <div class="stat-number">
-                        <a href="/token-dashboard" style="color: #667eea; text-decoration: none;">
+                        <a href="{campaign.url_prefix}/token-dashboard" style="color: #667eea; text-decoration: none;">
                             💰 Token Dashboard
                         </a>
                     </div>
@@ -660,27 +2349,30 @@ def dashboard():
             </div>
             
             <h2>Registered Users:</h2>
+            <div id="userList">
     '''
     for user in users:
         twitter_info = f" | Twitter: @{user[1]}" if user[1] else ""
-        points_info = f" | Points: {user[2]}" if user[2] else ""
-        html += f'<div class="user-card">{user[0]}{twitter_info}{points_info} | Joined: {user[3]}</div>'
+        html += f'<div class="user-card" data-wallet="{user[0]}">{user[0]}{twitter_info} | Points: <span class="points">{user[2]}</span> | Joined: {user[3]}</div>'
     
-    html += '</div></body></html>'
+    dashboard_script = url_for('static', filename='dashboard.js')
+    html += f'</div></div><script src="{dashboard_script}"></script></body></html>'
     return html
 
-@app.route('/tasks')
+@campaign_route('/tasks')
 def tasks_page():
     return render_template('tasks.html')
 
-@app.route('/profile')
+@campaign_route('/profile')
 def profile_page():
     return render_template('profile.html')
 
-@app.route('/token-dashboard')
+@campaign_route('/token-dashboard')
 def token_dashboard():
     """Token distribution dashboard"""
-    conn = sqlite3.connect('airdrop.db')
+    campaign = current_campaign()
+    conn = campaign.replica.connect(max_age=resync_max_age())
+    replica_status = campaign.replica.status(conn)
     c = conn.cursor()
     
     # Get distribution stats
@@ -709,18 +2401,74 @@ def token_dashboard():
     return render_template('token_dashboard.html', 
                          stats=stats,
                          recent_distributions=recent_distributions,
-                         config=TOKEN_CONFIG)
+                         replica_status=replica_status,
+                         config=campaign.token_config)
+
+@campaign_route('/events')
+def events():
+    """Server-sent events feed of registrations, task completions and distributions"""
+    topics = set(filter(None, request.args.get('topics', '').split(',')))
+    wallet_filter = request.args.get('wallet', '').strip()
+    if wallet_filter:
+        wallet_filter = lookup_wallet_address(wallet_filter)
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    # Snapshot time of a page rendered from the replica: replay what it missed
+    since = request.args.get('since', type=float)
+    campaign_slug = current_campaign().slug
+    
+    def stream():
+        subscriber, complete = event_broker.subscribe(last_event_id, since)
+        try:
+            yield 'retry: 5000\n\n'
+            if not complete:
+                # Deltas since the snapshot are gone; the page has to re-render
+                yield 'event: resync\ndata: {}\n\n'
+            while True:
+                try:
+                    event = subscriber.get(timeout=EVENT_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    if not event_broker.is_subscribed(subscriber):
+                        break
+                    yield ': keepalive\n\n'
+                    continue
+                
+                if event['data'].get('campaign') != campaign_slug:
+                    continue
+                if topics and event['type'] not in topics:
+                    continue
+                if wallet_filter and event['data'].get('wallet_address') != wallet_filter:
+                    continue
+                yield format_sse(event)
+        finally:
+            event_broker.unsubscribe(subscriber)
+    
+    return Response(stream_with_context(stream()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
-@app.route('/complete-task', methods=['POST'])
+@campaign_route('/complete-task', methods=['POST'])
 def complete_user_task():
     try:
         data = request.get_json()
-        wallet_address = data.get('wallet_address', '').strip()
+        wallet_address = lookup_wallet_address(data.get('wallet_address', '').strip())
         task_name = data.get('task_name', '')
         
         if not wallet_address or not task_name:
             return jsonify({'success': False, 'message': 'Missing parameters'})
         
+        # Without a bot configured join_telegram stays self-reported (simulation mode)
+        if task_name == 'join_telegram' and TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID:
+            if not is_telegram_linked(wallet_address):
+                code = create_telegram_link_code(wallet_address)
+                return jsonify({
+                    'success': False,
+                    'message': f'Link your Telegram account first: send /start {code} to our bot, join the group, then press Complete again.',
+                    'telegram_link': f'https://t.me/{TELEGRAM_BOT_USERNAME}?start={code}' if TELEGRAM_BOT_USERNAME else None
+                })
+            if not is_telegram_member(wallet_address):
+                return jsonify({'success': False, 'message': 'Your linked Telegram account has not joined our group yet.'})
+        
         if complete_task(wallet_address, task_name):
             return jsonify({'success': True, 'message': 'Task completed successfully!'})
         else:
@@ -728,22 +2476,20 @@ def complete_user_task():
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error: {str(e)}'})
 
-@app.route('/tasks/<wallet_address>')
+@campaign_route('/tasks/<wallet_address>')
 def get_tasks(wallet_address):
+    wallet_address = lookup_wallet_address(wallet_address)
     try:
         tasks = get_user_tasks(wallet_address)
         
         task_descriptions = {
-            'join_airdrop': {'name': 'Join Airdrop', 'points': 100},
-            'follow_twitter': {'name': 'Follow us on Twitter', 'points': 50},
-            'retweet': {'name': 'Retweet our pinned post', 'points': 75},
-            'join_telegram': {'name': 'Join our Telegram', 'points': 50},
-            'invite_friends': {'name': 'Invite 3 friends', 'points': 150}
+            task_id: {'name': task_name, 'points': points}
+            for task_id, task_name, points in current_campaign().tasks
         }
         
         completed_tasks = sum(1 for task in tasks.values() if task['completed'])
         total_tasks = len(task_descriptions)
-        total_points = sum(task_descriptions[task_id]['points'] for task_id, task in tasks.items() if task['completed'])
+        total_points = sum(task_descriptions[task_id]['points'] for task_id, task in tasks.items() if task['completed'] and task_id in task_descriptions)
         max_points = sum(task['points'] for task in task_descriptions.values())
         
         return jsonify({
@@ -760,10 +2506,11 @@ def get_tasks(wallet_address):
     except Exception as e:
         return jsonify({'error': str(e)})
 
-@app.route('/user-tokens/<wallet_address>')
+@campaign_route('/user-tokens/<wallet_address>')
 def get_user_tokens(wallet_address):
     """Get user token information"""
-    conn = sqlite3.connect('airdrop.db')
+    wallet_address = lookup_wallet_address(wallet_address)
+    conn = connect_db()
     c = conn.cursor()
     
     # Get user points and tokens
@@ -786,17 +2533,17 @@ def get_user_tokens(wallet_address):
             'tokens_distributed': tokens_distributed,
             'distribution_status': status,
             'tx_hash': tx_hash,
-            'points_to_tokens_ratio': TOKEN_CONFIG['points_to_tokens_ratio'],
+            'points_to_tokens_ratio': current_campaign().token_config['points_to_tokens_ratio'],
             'next_tokens': calculate_tokens_from_points(points)
         })
     else:
         return jsonify({'error': 'User not found'})
 
-@app.route('/claim-tokens', methods=['POST'])
+@campaign_route('/claim-tokens', methods=['POST'])
 def claim_tokens():
     """Simulate token claim"""
     data = request.get_json()
-    wallet_address = data.get('wallet_address', '').strip()
+    wallet_address = lookup_wallet_address(data.get('wallet_address', '').strip())
     
     if not wallet_address:
         return jsonify({'success': False, 'message': 'Wallet address required'})
@@ -816,24 +2563,33 @@ def claim_tokens():
             'message': f'Minimum {10} tokens required for distribution. You have {tokens_earned}.'
         })
 
-@app.route('/verify-twitter', methods=['POST'])
-def verify_twitter():
+def twitter_busy_response(e):
+    """429 for a verification the shared Twitter budget can't serve yet - not a failed check"""
+    response = jsonify({
+        'success': False,
+        'message': f'⏳ Twitter verification is busy right now. Please try again in {e.retry_after}s.',
+        'verified': False,
+        'retry_after': e.retry_after
+    })
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, 429
+
+@campaign_route('/verify-twitter', methods=['POST'])
+async def verify_twitter():
     try:
         data = request.get_json()
-        wallet_address = data.get('wallet_address', '').strip()
+        wallet_address = lookup_wallet_address(data.get('wallet_address', '').strip())
         twitter_handle = data.get('twitter_handle', '').strip().replace('@', '')
         
         if not wallet_address or not twitter_handle:
             return jsonify({'success': False, 'message': 'Wallet address and Twitter handle are required'})
         
-        print(f"🐦 Verifying Twitter follow for: {twitter_handle}")
+        web_log.debug('Verifying Twitter follow', extra={'twitter_handle': twitter_handle})
         
-        # Verify Twitter follow
-        follows_project, twitter_id = verify_twitter_follow(twitter_handle)
+        # The follow check's user lookup also carries the profile metrics
+        [(follows_project, twitter_id, user_info)] = await run_twitter_calls(verify_twitter_follow_async(twitter_handle))
         
         if follows_project:
-            # Get additional user info
-            user_info = get_twitter_user_info(twitter_handle)
             follower_count = user_info.get('public_metrics', {}).get('followers_count', 0) if user_info else 0
             
             # Save verification data
@@ -862,15 +2618,17 @@ def verify_twitter():
                 'verified': False
             })
             
-    except Exception as e:
-        print(f"❌ Twitter Verification Error: {e}")
+    except TwitterRateLimited as e:
+        return twitter_busy_response(e)
+    except Exception:
+        web_log.exception('Twitter verification error')
         return jsonify({'success': False, 'message': 'Twitter verification failed. Please try again.'})
 
-@app.route('/verify-retweet', methods=['POST'])
-def verify_retweet():
+@campaign_route('/verify-retweet', methods=['POST'])
+async def verify_retweet():
     try:
         data = request.get_json()
-        wallet_address = data.get('wallet_address', '').strip()
+        wallet_address = lookup_wallet_address(data.get('wallet_address', '').strip())
         twitter_handle = data.get('twitter_handle', '').strip().replace('@', '')
         tweet_url = data.get('tweet_url', '')
         
@@ -885,14 +2643,12 @@ def verify_retweet():
         if not tweet_id:
             return jsonify({'success': False, 'message': 'Invalid tweet URL'})
         
-        print(f"🔁 Verifying retweet for: {twitter_handle}, Tweet: {tweet_id}")
+        web_log.debug('Verifying retweet', extra={'twitter_handle': twitter_handle, 'tweet_id': tweet_id})
         
-        # Verify retweet
-        retweeted = verify_twitter_retweet(twitter_handle, tweet_id)
+        # The retweet check's user lookup also returns the Twitter user info
+        [(retweeted, user_info)] = await run_twitter_calls(verify_twitter_retweet_async(twitter_handle, tweet_id))
         
         if retweeted:
-            # Get Twitter user info
-            user_info = get_twitter_user_info(twitter_handle)
             twitter_id = user_info['id'] if user_info else f"retweet_{twitter_handle}_id"
             
             # Save verification data
@@ -919,10 +2675,33 @@ def verify_retweet():
                 'verified': False
             })
             
-    except Exception as e:
-        print(f"❌ Retweet Verification Error: {e}")
+    except TwitterRateLimited as e:
+        return twitter_busy_response(e)
+    except Exception:
+        web_log.exception('Retweet verification error')
         return jsonify({'success': False, 'message': 'Retweet verification failed. Please try again.'})
 
+@app.route('/telegram/webhook', methods=['POST'])
+def telegram_webhook():
+    """Bot API webhook for every campaign; Telegram sends the secret from setWebhook in a header"""
+    if not TELEGRAM_WEBHOOK_SECRET:
+        return jsonify({'success': False, 'message': 'Telegram webhook not configured'}), 403
+    supplied = request.headers.get('X-Telegram-Bot-Api-Secret-Token', '')
+    if not secrets.compare_digest(supplied, TELEGRAM_WEBHOOK_SECRET):
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 401
+    
+    update = request.get_json(silent=True)
+    if not isinstance(update, dict):
+        return jsonify({'success': False, 'message': 'Expected a JSON update object'}), 400
+    
+    # A skipped update still gets a 200, otherwise Telegram redelivers it forever
+    conn = connect_telegram()
+    try:
+        apply_telegram_updates(conn, [update])
+    finally:
+        conn.close()
+    return jsonify({'success': True})
+
 @app.route('/twitter-status')
 def twitter_status():
     """Check Twitter API status"""
@@ -941,26 +2720,873 @@ def twitter_status():
     if status['api_ready']:
         try:
             headers = {'Authorization': f'Bearer {bearer_token}'}
-            test_url = f'https://api.twitter.com/2/users/by/username/{TWITTER_USERNAME}'
-            response = requests.get(test_url, headers=headers)
+            response = run_twitter_call_sync(
+                twitter_api_get('users_by_username', f'/2/users/by/username/{TWITTER_USERNAME}', headers=headers))
             status['api_test'] = response.status_code == 200
             status['api_test_message'] = '✅ Twitter API connected successfully!' if status['api_test'] else f'❌ API test failed: {response.status_code}'
         except Exception as e:
             status['api_test'] = False
             status['api_test_message'] = f'❌ API test error: {str(e)}'
     
+    status['rate_limits'] = get_twitter_budget_snapshot()
     return jsonify(status)
 
-@app.route('/test')
+@campaign_route('/test')
 def test_route():
     status = {
         'server': '✅ Running',
         'database': '✅ Connected', 
         'twitter_api': '✅ Ready' if (TWITTER_BEARER_TOKEN or (TWITTER_API_KEY and TWITTER_API_SECRET)) else '❌ Not configured',
-        'token_system': '✅ Active'
+        'token_system': '✅ Active',
+        'event_subscribers': event_broker.subscriber_count(),
+        'campaign': current_campaign().slug,
+        'replica': current_campaign().replica.status(),
+        'admission_filter': current_campaign().admission.stats(),
+        'db_pool': db_pool.stats(),
+        'logging': log_handler.stats()
     }
     return jsonify(status)
 
+@campaign_route('/stats/timeseries')
+def stats_timeseries():
+    """Signups, task completions and referral conversion per minute or hour bucket"""
+    metric = request.args.get('metric', 'registrations')
+    dimension = request.args.get('dimension')
+    resolution = request.args.get('resolution', 'hour')
+    
+    if metric not in STATS_METRICS:
+        return jsonify({'success': False, 'message': f'Metric must be one of: {", ".join(STATS_METRICS)}'}), 400
+    if resolution not in STATS_RESOLUTIONS:
+        return jsonify({'success': False, 'message': 'Resolution must be minute or hour'}), 400
+    
+    table, width = STATS_RESOLUTIONS[resolution]
+    now = int(time.time())
+    try:
+        end = parse_stats_time(request.args.get('end'), now)
+        start = parse_stats_time(request.args.get('start'), end - 24 * 3600)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'start and end must be ISO timestamps or epoch seconds'}), 400
+    
+    start -= start % width
+    if end <= start or (end - start) // width > STATS_MAX_BUCKETS:
+        return jsonify({'success': False, 'message': f'Range must cover 1 to {STATS_MAX_BUCKETS} buckets'}), 400
+    
+    def read_buckets(name, dimension=None):
+        # Primary-key range scan: reads only the buckets inside [start, end).
+        # dimension sits between metric and bucket in the key, so it is always
+        # bound - to '' for the undimensioned metrics, or to every task id in
+        # the catalog for a task_completions total - to keep the bucket range
+        # usable for the search.
+        if dimension is not None:
+            dimensions = [dimension]
+        elif name == 'task_completions':
+            dimensions = [task_id for task_id, _, _ in current_campaign().tasks]
+        else:
+            dimensions = ['']
+        c.execute(f'''
+            SELECT bucket, SUM(value) FROM {table}
+            WHERE metric = ? AND dimension IN ({', '.join('?' * len(dimensions))}) AND bucket >= ? AND bucket < ?
+            GROUP BY bucket
+        ''', [name, *dimensions, start, end])
+        return dict(c.fetchall())
+    
+    conn = connect_db()
+    c = conn.cursor()
+    if metric == 'referral_conversion':
+        registrations = read_buckets('registrations')
+        referred = read_buckets('referred_registrations')
+        values = {bucket: round(referred.get(bucket, 0) / count, 6) for bucket, count in registrations.items() if count}
+    else:
+        values = read_buckets(metric, dimension)
+    conn.close()
+    
+    return jsonify({
+        'success': True,
+        'metric': metric,
+        'dimension': dimension,
+        'resolution': resolution,
+        'buckets': [
+            {
+                'bucket': datetime.fromtimestamp(bucket, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'value': values.get(bucket, 0)
+            }
+            for bucket in range(start, end, width)
+        ]
+    })
+
+ADMIN_SEARCH_FIELDS = ('wallet_address', 'twitter_handle', 'email', 'referral_code')
+ADMIN_SEARCH_MAX_LIMIT = 100
+
+@campaign_route('/admin/search')
+@require_admin_token
+def admin_search():
+    """Substring search over wallets, Twitter handles, emails and referral codes"""
+    query = request.args.get('q', '').strip()
+    field = request.args.get('field', '')
+    limit = max(1, min(request.args.get('limit', 20, type=int), ADMIN_SEARCH_MAX_LIMIT))
+    before_id = request.args.get('before_id', type=int)
+    
+    # Trigram index needs at least three characters to match on
+    if len(query) < 3:
+        return jsonify({'success': False, 'message': 'Search needs at least 3 characters'}), 400
+    if field and field not in ADMIN_SEARCH_FIELDS:
+        return jsonify({'success': False, 'message': f'Field must be one of: {", ".join(ADMIN_SEARCH_FIELDS)}'}), 400
+    
+    phrase = '"' + query.replace('"', '""') + '"'
+    match = f'{field} : {phrase}' if field else phrase
+    
+    conn = connect_db()
+    c = conn.cursor()
+    c.execute('''
+        SELECT u.id, u.wallet_address, u.twitter_handle, u.email, u.referral_code, u.points, u.registered_at
+        FROM users_search s
+        JOIN users u ON u.id = s.rowid
+        WHERE users_search MATCH ? AND s.rowid < ?
+        ORDER BY s.rowid DESC
+        LIMIT ?
+    ''', (match, before_id or sys.maxsize, limit + 1))
+    rows = c.fetchall()
+    conn.close()
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return jsonify({
+        'success': True,
+        'results': [
+            {
+                'id': user_id,
+                'wallet_address': wallet_address,
+                'twitter_handle': twitter_handle,
+                'email': email,
+                'referral_code': referral_code,
+                'points': points,
+                'registered_at': registered_at
+            }
+            for user_id, wallet_address, twitter_handle, email, referral_code, points, registered_at in rows
+        ],
+        'next_before_id': rows[-1][0] if has_more else None
+    })
+
+@campaign_route('/admin/export')
+@require_admin_token
+def admin_export():
+    """Stream users with allocations, Twitter verification and task flags as CSV or JSONL"""
+    file_format = request.args.get('format', 'csv')
+    if file_format not in ('csv', 'jsonl'):
+        return jsonify({'success': False, 'message': 'Format must be csv or jsonl'}), 400
+    
+    use_gzip = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+    batch_size = max(1, min(request.args.get('batch_size', EXPORT_BATCH_SIZE, type=int), 50000))
+    
+    # Served from the read replica so a large export never holds up signups
+    chunks = iter_export_text(file_format, batch_size, use_replica=True)
+    filename = f"{current_campaign().slug}-users-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{file_format}"
+    headers = {'X-Accel-Buffering': 'no', 'X-Data-As-Of': current_campaign().replica.status()['refreshed_at'] or ''}
+    if use_gzip:
+        chunks = gzip_chunks(chunks)
+        filename += '.gz'
+    headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    
+    mimetype = 'text/csv' if file_format == 'csv' else 'application/x-ndjson'
+    if use_gzip:
+        mimetype = 'application/gzip'
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+# Bulk allowlist import (flask --app app import-allowlist partners.csv)
+IMPORT_BATCH_SIZE = 5000
+SQL_IN_CHUNK = 500
+
+def read_allowlist_rows(path, file_format):
+    """Stream (line_number, record) pairs from a CSV or JSONL allowlist; record is None if unparsable"""
+    with open(path, newline='', encoding='utf-8') as f:
+        if file_format == 'jsonl':
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                yield line_number, record if isinstance(record, dict) else None
+            return
+        
+        reader = csv.reader(f)
+        columns = ['wallet_address', 'email', 'twitter_handle']
+        for row in reader:
+            line_number = reader.line_num
+            if not row:
+                continue
+            if line_number == 1 and 'wallet_address' in [cell.strip() for cell in row]:
+                columns = [cell.strip() for cell in row]
+                continue
+            yield line_number, dict(zip(columns, row))
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def validate_allowlist_batch(batch):
+    """Checksum-validate one batch of allowlist rows (runs in a worker process)"""
+    results = []
+    for line_number, record in batch:
+        if record is None:
+            results.append((line_number, '', None, None, None, 'unparsable'))
+            continue
+        
+        wallet_address = str(record.get('wallet_address') or '').strip()
+        email = str(record.get('email') or '').strip() or None
+        twitter_handle = str(record.get('twitter_handle') or '').strip().replace('@', '') or None
+        
+        if not is_valid_wallet_address(wallet_address):
+            results.append((line_number, wallet_address, None, email, twitter_handle, 'invalid_format'))
+            continue
+        
+        canonical = canonicalize_wallet_address(wallet_address)
+        reason = None if canonical else 'bad_checksum'
+        results.append((line_number, wallet_address, canonical, email, twitter_handle, reason))
+    return results
+
+def select_existing(c, column, values):
+    """Return the subset of values already present in users.<column>"""
+    existing = set()
+    values = list(values)
+    for i in range(0, len(values), SQL_IN_CHUNK):
+        chunk = values[i:i + SQL_IN_CHUNK]
+        placeholders = ','.join('?' * len(chunk))
+        c.execute(f'SELECT {column} FROM users WHERE {column} IN ({placeholders})', chunk)
+        existing.update(row[0] for row in c.fetchall())
+    return existing
+
+def insert_allowlist_batch(conn, rows):
+    """Register a batch of (wallet, email, twitter_handle) in one transaction; returns wallets already registered"""
+    c = conn.cursor()
+    c.execute('BEGIN IMMEDIATE')
+    
+    try:
+        existing = select_existing(c, 'wallet_address', (row[0] for row in rows))
+        rows = [row for row in rows if row[0] not in existing]
+        
+        # Draw referral codes until none collide with issued ones
+        codes = {}
+        pending = [row[0] for row in rows]
+        while pending:
+            for wallet_address in pending:
+                codes[wallet_address] = generate_referral_code()
+            taken = select_existing(c, 'referral_code', (codes[w] for w in pending))
+            pending_set = set(pending)
+            issued = set(codes[w] for w in codes if w not in pending_set)
+            retry = []
+            for wallet_address in pending:
+                code = codes[wallet_address]
+                if code in taken or code in issued:
+                    retry.append(wallet_address)
+                issued.add(code)
+            pending = retry
+        
+        # Same end state as /join-airdrop: join_airdrop task done and its points credited
+        join_points = current_campaign().task_points.get('join_airdrop', 0)
+        c.executemany('''
+            INSERT INTO users (wallet_address, email, twitter_handle, referral_code, points)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(wallet, email, handle, codes[wallet], join_points) for wallet, email, handle in rows])
+        
+        c.executemany('''
+            INSERT OR IGNORE INTO user_tasks (wallet_address, task_name, completed, completed_at)
+            VALUES (?, ?, ?, CASE WHEN ? THEN CURRENT_TIMESTAMP END)
+        ''', [(wallet, task_id, task_id == 'join_airdrop', task_id == 'join_airdrop')
+              for wallet, _, _ in rows for task_id, _, _ in current_campaign().tasks])
+        
+        c.executemany('''
+            INSERT OR IGNORE INTO token_distribution (wallet_address, tokens_earned)
+            VALUES (?, ?)
+        ''', [(wallet, calculate_tokens_from_points(join_points)) for wallet, _, _ in rows])
+        
+        if rows:
+            record_rollup(c, 'registrations', amount=len(rows))
+            record_rollup(c, 'task_completions', 'join_airdrop', amount=len(rows))
+        
+        c.execute('COMMIT')
+        return existing
+    except Exception:
+        c.execute('ROLLBACK')
+        raise
+
+def campaign_option(command):
+    """--campaign for CLI commands; selects the database current_campaign() resolves to"""
+    def set_campaign(ctx, param, value):
+        ctx.call_on_close(lambda: g.pop('campaign', None))
+        g.campaign = CAMPAIGNS[value]
+    return click.option('--campaign', type=click.Choice(sorted(CAMPAIGNS)), default=DEFAULT_CAMPAIGN,
+                        show_default=True, expose_value=False, callback=set_campaign,
+                        help='Campaign to operate on')(command)
+
+@app.cli.command('import-allowlist')
+@campaign_option
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'jsonl']),
+              help='Input format (defaults to the file extension)')
+@click.option('--batch-size', default=IMPORT_BATCH_SIZE, show_default=True, help='Rows per transaction')
+@click.option('--workers', default=os.cpu_count() or 1, show_default=True, help='Processes for checksum validation')
+@click.option('--rejects', type=click.Path(dir_okay=False), help='Write rejected rows to this CSV file')
+def import_allowlist(path, file_format, batch_size, workers, rejects):
+    """Bulk-register allowlisted wallets from a CSV or JSONL file"""
+    file_format = file_format or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+    started = time.time()
+    counts = {'imported': 0, 'already_registered': 0, 'duplicate_in_file': 0,
+              'invalid_format': 0, 'bad_checksum': 0, 'unparsable': 0}
+    seen = set()
+    
+    conn = connect_db(isolation_level=None)
+    rejects_file = open(rejects, 'w', newline='', encoding='utf-8') if rejects else None
+    rejects_writer = csv.writer(rejects_file) if rejects_file else None
+    if rejects_writer:
+        rejects_writer.writerow(['line', 'wallet_address', 'reason'])
+    
+    def reject(line_number, wallet_address, reason):
+        counts[reason] += 1
+        if rejects_writer:
+            rejects_writer.writerow([line_number, wallet_address, reason])
+    
+    def handle(results):
+        rows = []
+        lines = {}
+        for line_number, wallet_address, canonical, email, twitter_handle, reason in results:
+            if reason:
+                reject(line_number, wallet_address, reason)
+            elif canonical in seen:
+                reject(line_number, wallet_address, 'duplicate_in_file')
+            else:
+                seen.add(canonical)
+                lines[canonical] = line_number
+                rows.append((canonical, email, twitter_handle))
+        
+        if rows:
+            existing = insert_allowlist_batch(conn, rows)
+            for wallet_address in existing:
+                reject(lines[wallet_address], wallet_address, 'already_registered')
+            counts['imported'] += len(rows) - len(existing)
+    
+    try:
+        # Keep a bounded number of batches in flight so the input is streamed
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque()
+            for batch in batched(read_allowlist_rows(path, file_format), batch_size):
+                in_flight.append(executor.submit(validate_allowlist_batch, batch))
+                if len(in_flight) >= workers * 2:
+                    handle(in_flight.popleft().result())
+            while in_flight:
+                handle(in_flight.popleft().result())
+    finally:
+        conn.close()
+        if rejects_file:
+            rejects_file.close()
+    
+    elapsed = time.time() - started
+    rejected = sum(count for reason, count in counts.items() if reason != 'imported')
+    rate = (counts['imported'] + rejected) / elapsed * 60 if elapsed else 0
+    print(f"✅ Imported {counts['imported']:,} wallets in {elapsed:.1f}s ({rate:,.0f} rows/min)")
+    if rejected:
+        details = ', '.join(f"{reason}: {count:,}" for reason, count in counts.items() if reason != 'imported' and count)
+        print(f"❌ Rejected {rejected:,} rows ({details})")
+
+# Streaming export (flask --app app export-users out.csv.gz)
+EXPORT_BATCH_SIZE = 5000
+EXPORT_BOOLEAN_COLUMNS = {'twitter_verified', 'is_verified', 'following_project', 'retweeted_post'}
+
+def get_export_columns():
+    columns = [
+        'wallet_address', 'email', 'twitter_handle', 'twitter_id', 'twitter_verified', 'is_verified',
+        'referral_code', 'referred_by', 'points', 'registered_at',
+        'tokens_earned', 'tokens_distributed', 'distribution_status', 'distribution_tx_hash', 'distribution_date',
+        'follower_count', 'following_project', 'retweeted_post', 'twitter_verified_at'
+    ]
+    return columns + [f'task_{task_id}' for task_id, _, _ in current_campaign().tasks]
+
+def build_export_query():
+    """Return (sql, params) for the export; task ids are bound, never pasted into the SQL"""
+    # Task flags are correlated lookups on the UNIQUE(wallet_address, task_name)
+    # index so SQLite can stream rows without a GROUP BY sort
+    task_ids = [task_id for task_id, _, _ in current_campaign().tasks]
+    task_columns = ',\n'.join(
+        'COALESCE((SELECT completed FROM user_tasks WHERE wallet_address = u.wallet_address AND task_name = ?), 0)'
+        for _ in task_ids
+    )
+    sql = f'''
+        SELECT u.wallet_address, u.email, u.twitter_handle, u.twitter_id, u.twitter_verified, u.is_verified,
+               u.referral_code, u.referred_by, u.points, u.registered_at,
+               td.tokens_earned, td.tokens_distributed, td.distribution_status, td.distribution_tx_hash,
+               td.distribution_date,
+               tv.follower_count, tv.following_project, tv.retweeted_post, tv.verified_at,
+               {task_columns}
+        FROM users u
+        LEFT JOIN token_distribution td ON td.wallet_address = u.wallet_address
+        LEFT JOIN twitter_verification tv ON tv.id = (
+            SELECT id FROM twitter_verification
+            WHERE wallet_address = u.wallet_address
+            ORDER BY verified_at DESC LIMIT 1
+        )
+        ORDER BY u.id
+    '''
+    return sql, task_ids
+
+def iter_export_batches(batch_size=EXPORT_BATCH_SIZE, use_replica=False):
+    """Yield joined user rows in fixed-size batches from one consistent snapshot"""
+    conn = current_campaign().replica.connect() if use_replica else connect_db()
+    conn.isolation_level = None
+    c = conn.cursor()
+    
+    try:
+        # A read transaction pins the WAL snapshot; writers carry on meanwhile
+        c.execute('BEGIN')
+        c.execute(*build_export_query())
+        while True:
+            rows = c.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+        c.execute('COMMIT')
+    finally:
+        conn.close()
+
+def export_row_to_dict(columns, row):
+    record = dict(zip(columns, row))
+    for column in columns:
+        if column in EXPORT_BOOLEAN_COLUMNS or column.startswith('task_'):
+            if record[column] is not None:
+                record[column] = bool(record[column])
+    return record
+
+def format_export_batch(file_format, columns, rows):
+    """Render one batch of rows as CSV or JSONL text"""
+    if file_format == 'csv':
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+    return ''.join(json.dumps(export_row_to_dict(columns, row)) + '\n' for row in rows)
+
+def iter_export_text(file_format, batch_size=EXPORT_BATCH_SIZE, use_replica=False):
+    """Yield CSV or JSONL text, one chunk per batch"""
+    columns = get_export_columns()
+    
+    if file_format == 'csv':
+        yield format_export_batch('csv', columns, [columns])
+    
+    for rows in iter_export_batches(batch_size, use_replica):
+        yield format_export_batch(file_format, columns, rows)
+
+def gzip_chunks(chunks):
+    """Gzip a stream of text chunks incrementally"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+def export_parquet(path, batch_size, compression):
+    """Write the export as Parquet, one row group per batch"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise click.UsageError('Parquet export needs pyarrow (pip install pyarrow)')
+    
+    columns = get_export_columns()
+    string_columns = {'wallet_address', 'email', 'twitter_handle', 'twitter_id', 'referral_code', 'referred_by',
+                      'registered_at', 'distribution_status', 'distribution_tx_hash', 'distribution_date',
+                      'twitter_verified_at'}
+    schema = pa.schema([
+        (column, pa.string() if column in string_columns
+         else pa.bool_() if column in EXPORT_BOOLEAN_COLUMNS or column.startswith('task_')
+         else pa.int64())
+        for column in columns
+    ])
+    
+    rows_written = 0
+    with pq.ParquetWriter(path, schema, compression=compression) as writer:
+        for rows in iter_export_batches(batch_size):
+            records = [export_row_to_dict(columns, row) for row in rows]
+            writer.write_table(pa.Table.from_pylist(records, schema=schema))
+            rows_written += len(rows)
+    return rows_written
+
+@app.cli.command('export-users')
+@campaign_option
+@click.argument('path', type=click.Path(dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'jsonl', 'parquet']),
+              help='Output format (defaults to the file extension)')
+@click.option('--gzip', 'use_gzip', is_flag=True, help='Gzip the output (implied by a .gz path)')
+@click.option('--batch-size', default=EXPORT_BATCH_SIZE, type=click.IntRange(min=1), show_default=True,
+              help='Rows fetched per batch')
+def export_users(path, file_format, use_gzip, batch_size):
+    """Export users with allocations, Twitter verification and task flags"""
+    use_gzip = use_gzip or path.endswith('.gz')
+    base_path = path[:-3] if path.endswith('.gz') else path
+    file_format = file_format or os.path.splitext(base_path)[1].lstrip('.').lower()
+    if file_format not in ('csv', 'jsonl', 'parquet'):
+        raise click.UsageError('Cannot infer format from the file name, pass --format')
+    
+    started = time.time()
+    if file_format == 'parquet':
+        rows_written = export_parquet(path, batch_size, 'gzip' if use_gzip else 'snappy')
+    else:
+        opener = gzip.open if use_gzip else open
+        columns = get_export_columns()
+        rows_written = 0
+        with opener(path, 'wt', encoding='utf-8', newline='') as f:
+            if file_format == 'csv':
+                f.write(format_export_batch('csv', columns, [columns]))
+            # Count rows, not lines: CSV fields may contain newlines
+            for rows in iter_export_batches(batch_size):
+                f.write(format_export_batch(file_format, columns, rows))
+                rows_written += len(rows)
+    
+    print(f"✅ Exported {rows_written:,} users to {path} in {time.time() - started:.1f}s")
+
+@app.cli.command('rebuild-stats')
+@campaign_option
+@click.option('--since', help='Recompute buckets from this ISO timestamp or epoch (default: everything)')
+def rebuild_stats(since):
+    """Recompute rollup buckets from the base tables to correct drift or backfilled rows"""
+    since_ts = parse_stats_time(since, 0)
+    started = time.time()
+    
+    conn = connect_db(isolation_level=None)
+    c = conn.cursor()
+    try:
+        c.execute('BEGIN IMMEDIATE')
+        rebuild_rollups(c, since_ts)
+        c.execute('COMMIT')
+    except Exception:
+        c.execute('ROLLBACK')
+        raise
+    finally:
+        conn.close()
+    print(f"✅ Rebuilt rollups since {datetime.fromtimestamp(since_ts, timezone.utc):%Y-%m-%d %H:%M} UTC in {time.time() - started:.1f}s")
+
+# On-chain eligibility scan (flask --app app scan-eligibility --rpc-url http://127.0.0.1:8545)
+ETH_RPC_URL = os.getenv('ETH_RPC_URL', 'http://127.0.0.1:8545')
+ELIGIBILITY_CHUNK_SIZE = 5000  # wallets read and written per transaction
+ELIGIBILITY_RPC_BATCH_SIZE = 100  # wallets per JSON-RPC batch (two calls each)
+ELIGIBILITY_CONCURRENCY = 8
+ELIGIBILITY_CONFIRMATIONS = 12
+ELIGIBILITY_RPC_ATTEMPTS = 4
+ELIGIBILITY_MIN_BALANCE_WEI = int(os.getenv('ELIGIBILITY_MIN_BALANCE_WEI', '1'))
+ELIGIBILITY_MIN_TX_COUNT = int(os.getenv('ELIGIBILITY_MIN_TX_COUNT', '1'))
+# When set, wallets the last scan found ineligible earn no tokens
+ELIGIBILITY_GATE = os.getenv('ELIGIBILITY_GATE', '').lower() in ('1', 'true', 'yes')
+
+class RpcError(Exception):
+    pass
+
+class EthRpcClient:
+    """JSON-RPC batch client over one pooled HTTP connection set, with bounded concurrency"""
+
+    def __init__(self, url, concurrency):
+        self.url = url
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.client = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        )
+        self.requests_sent = 0
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def batch(self, calls):
+        """Send [(method, params), ...] as one batch; returns results in call order, RpcError for failed calls"""
+        payload = [{'jsonrpc': '2.0', 'id': i, 'method': method, 'params': params}
+                   for i, (method, params) in enumerate(calls)]
+        
+        async with self.semaphore:
+            for attempt in range(ELIGIBILITY_RPC_ATTEMPTS):
+                try:
+                    response = await self.client.post(self.url, json=payload)
+                    self.requests_sent += 1
+                    if response.status_code == 429 or response.status_code >= 500:
+                        raise RpcError(f'HTTP {response.status_code}')
+                    response.raise_for_status()
+                    replies = response.json()
+                    break
+                except (httpx.TransportError, RpcError) as e:
+                    if attempt == ELIGIBILITY_RPC_ATTEMPTS - 1:
+                        raise RpcError(f'Batch failed after {ELIGIBILITY_RPC_ATTEMPTS} attempts: {e}') from e
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+        
+        if isinstance(replies, dict):
+            # Whole-batch error object (e.g. batch too large)
+            raise RpcError(replies.get('error', replies))
+        
+        # Batch replies may come back in any order
+        results = [RpcError('No reply')] * len(calls)
+        for reply in replies:
+            if 'error' in reply:
+                results[reply['id']] = RpcError(reply['error'])
+            else:
+                results[reply['id']] = reply['result']
+        return results
+
+    async def call(self, method, params):
+        result = (await self.batch([(method, params)]))[0]
+        if isinstance(result, RpcError):
+            raise result
+        return result
+
+async def fetch_wallet_activity(rpc, wallets, block_tag):
+    """{wallet: (balance_wei, tx_count)} for the wallets the node answered for"""
+    calls = []
+    for wallet in wallets:
+        calls.append(('eth_getBalance', [wallet, block_tag]))
+        calls.append(('eth_getTransactionCount', [wallet, block_tag]))
+    
+    results = await rpc.batch(calls)
+    activity = {}
+    for i, wallet in enumerate(wallets):
+        balance, tx_count = results[2 * i], results[2 * i + 1]
+        if not isinstance(balance, RpcError) and not isinstance(tx_count, RpcError):
+            activity[wallet] = (int(balance, 16), int(tx_count, 16))
+    return activity
+
+def iter_unscanned_wallets(conn, block_number, chunk_size):
+    """Keyset-paged wallets from token_distribution with no cached result at block_number"""
+    c = conn.cursor()
+    last = ''
+    while True:
+        c.execute('''
+            SELECT td.wallet_address FROM token_distribution td
+            WHERE td.wallet_address > ?
+              AND NOT EXISTS (SELECT 1 FROM onchain_activity oa
+                              WHERE oa.block_number = ? AND oa.wallet_address = td.wallet_address)
+            ORDER BY td.wallet_address
+            LIMIT ?
+        ''', (last, block_number, chunk_size))
+        wallets = [row[0] for row in c.fetchall()]
+        if not wallets:
+            return
+        yield wallets
+        last = wallets[-1]
+
+def save_eligibility(conn, block_number, activity):
+    """Cache raw results for block_number and refresh the eligibility flags in one transaction"""
+    c = conn.cursor()
+    c.execute('BEGIN IMMEDIATE')
+    try:
+        # Balances can exceed SQLite's 64-bit integers, so wei is stored as text
+        c.executemany('''
+            INSERT OR REPLACE INTO onchain_activity (block_number, wallet_address, balance_wei, tx_count)
+            VALUES (?, ?, ?, ?)
+        ''', [(block_number, wallet, str(balance), tx_count) for wallet, (balance, tx_count) in activity.items()])
+        c.executemany('''
+            INSERT INTO wallet_eligibility (wallet_address, block_number, has_balance, has_transactions, eligible)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (wallet_address) DO UPDATE SET
+                block_number = excluded.block_number, has_balance = excluded.has_balance,
+                has_transactions = excluded.has_transactions, eligible = excluded.eligible,
+                updated_at = CURRENT_TIMESTAMP
+        ''', [(wallet, block_number, *eligibility_flags(balance, tx_count))
+              for wallet, (balance, tx_count) in activity.items()])
+        if ELIGIBILITY_GATE:
+            apply_eligibility(c, list(activity))
+        c.execute('COMMIT')
+    except Exception:
+        c.execute('ROLLBACK')
+        raise
+
+def eligibility_flags(balance, tx_count):
+    has_balance = balance >= ELIGIBILITY_MIN_BALANCE_WEI
+    has_transactions = tx_count >= ELIGIBILITY_MIN_TX_COUNT
+    return has_balance, has_transactions, has_balance or has_transactions
+
+def apply_eligibility(c, wallets):
+    """Recompute pending allocations for wallets from points and their eligibility flag"""
+    ratio = current_campaign().token_config['points_to_tokens_ratio']
+    for i in range(0, len(wallets), SQL_IN_CHUNK):
+        chunk = wallets[i:i + SQL_IN_CHUNK]
+        placeholders = ','.join('?' * len(chunk))
+        c.execute(f'''
+            UPDATE token_distribution SET tokens_earned =
+                CASE WHEN (SELECT eligible FROM wallet_eligibility WHERE wallet_address = token_distribution.wallet_address) = 0
+                     THEN 0
+                     ELSE (SELECT points FROM users WHERE wallet_address = token_distribution.wallet_address) / ?
+                END
+            WHERE distribution_status = 'pending' AND wallet_address IN ({placeholders})
+        ''', [ratio, *chunk])
+
+def is_wallet_eligible(c, wallet_address):
+    """False only if the gate is on and the last scan found the wallet ineligible"""
+    if not ELIGIBILITY_GATE:
+        return True
+    c.execute('SELECT eligible FROM wallet_eligibility WHERE wallet_address = ?', (wallet_address,))
+    row = c.fetchone()
+    return row is None or bool(row[0])
+
+async def scan_eligibility_async(conn, rpc_url, block, chunk_size, batch_size, concurrency, progress):
+    rpc = EthRpcClient(rpc_url, concurrency)
+    try:
+        if block is None:
+            latest = int(await rpc.call('eth_blockNumber', []), 16)
+            block = max(latest - ELIGIBILITY_CONFIRMATIONS, 0)
+        block_tag = hex(block)
+        progress(f"📌 Pinned to block {block:,}")
+        
+        counts = {'scanned': 0, 'eligible': 0, 'failed': 0}
+        for wallets in iter_unscanned_wallets(conn, block, chunk_size):
+            batches = [wallets[i:i + batch_size] for i in range(0, len(wallets), batch_size)]
+            results = await asyncio.gather(*(fetch_wallet_activity(rpc, batch, block_tag) for batch in batches),
+                                           return_exceptions=True)
+            activity = {}
+            for result in results:
+                if isinstance(result, Exception):
+                    eligibility_log.warning('RPC batch failed', extra={'error': str(result)})
+                else:
+                    activity.update(result)
+            
+            save_eligibility(conn, block, activity)
+            counts['scanned'] += len(activity)
+            counts['failed'] += len(wallets) - len(activity)
+            counts['eligible'] += sum(1 for balance, tx_count in activity.values()
+                                      if eligibility_flags(balance, tx_count)[2])
+            progress(f"🔎 {counts['scanned']:,} wallets scanned ({rpc.requests_sent:,} RPC requests)")
+        return block, counts
+    finally:
+        await rpc.close()
+
+@app.cli.command('scan-eligibility')
+@campaign_option
+@click.option('--rpc-url', default=ETH_RPC_URL, show_default=True, help='JSON-RPC endpoint (node, anvil or provider)')
+@click.option('--block', type=int, help=f'Block to read state at (default: latest - {ELIGIBILITY_CONFIRMATIONS})')
+@click.option('--chunk-size', default=ELIGIBILITY_CHUNK_SIZE, show_default=True, help='Wallets per database transaction')
+@click.option('--batch-size', default=ELIGIBILITY_RPC_BATCH_SIZE, show_default=True, help='Wallets per JSON-RPC batch')
+@click.option('--concurrency', default=ELIGIBILITY_CONCURRENCY, show_default=True, help='Batches in flight')
+def scan_eligibility(rpc_url, block, chunk_size, batch_size, concurrency):
+    """Flag wallets with on-chain activity (balance / transaction count) at a pinned block.
+
+    Results are cached per block, so re-running at the same block only
+    fetches wallets that are missing or failed last time.
+    """
+    started = time.time()
+    conn = connect_db(isolation_level=None)
+    try:
+        block, counts = asyncio.run(scan_eligibility_async(conn, rpc_url, block, chunk_size, batch_size,
+                                                           concurrency, print))
+    finally:
+        conn.close()
+    
+    elapsed = time.time() - started
+    rate = counts['scanned'] / elapsed * 60 if elapsed else 0
+    print(f"✅ Scanned {counts['scanned']:,} wallets at block {block:,} in {elapsed:.1f}s ({rate:,.0f} wallets/min), "
+          f"{counts['eligible']:,} eligible")
+    if counts['failed']:
+        print(f"❌ {counts['failed']:,} wallets failed - re-run with --block {block} to retry them")
+
+@app.cli.command('telegram-sync')
+@click.option('--webhook', 'webhook_url', help='Register this webhook URL instead of long polling')
+@click.option('--once', is_flag=True, help='Fetch and apply one batch of updates, then exit')
+def telegram_sync(webhook_url, once):
+    """Keep telegram_members in sync with the project chat from bot updates (all campaigns)"""
+    if not TELEGRAM_BOT_TOKEN:
+        raise click.UsageError('TELEGRAM_BOT_TOKEN is not set')
+    session = requests.Session()
+    
+    if webhook_url:
+        response = session.post(telegram_api_url('setWebhook'), json={
+            'url': webhook_url,
+            'secret_token': TELEGRAM_WEBHOOK_SECRET,
+            'allowed_updates': TELEGRAM_ALLOWED_UPDATES
+        }, timeout=30)
+        print(f"✅ Webhook set to {webhook_url}" if response.ok else f"❌ setWebhook failed: {response.text}")
+        return
+    
+    # getUpdates is refused while a webhook is registered
+    session.post(telegram_api_url('deleteWebhook'), timeout=30)
+    offset_key = f'update_offset:{TELEGRAM_BOT_TOKEN.split(":")[0]}'
+    conn = connect_telegram()
+    try:
+        c = conn.cursor()
+        c.execute('SELECT value FROM telegram_state WHERE key = ?', (offset_key,))
+        row = c.fetchone()
+        offset = int(row[0]) if row else None
+        print(f"🤖 Polling Telegram updates{' for chat ' + TELEGRAM_CHAT_ID if TELEGRAM_CHAT_ID else ''}...")
+        
+        failures = 0
+        while True:
+            try:
+                response = session.post(telegram_api_url('getUpdates'), json={
+                    'offset': offset,
+                    'timeout': 0 if once else TELEGRAM_POLL_TIMEOUT,
+                    'allowed_updates': TELEGRAM_ALLOWED_UPDATES
+                }, timeout=TELEGRAM_POLL_TIMEOUT + 10)
+                response.raise_for_status()
+                updates = response.json()['result']
+                failures = 0
+            except (requests.RequestException, ValueError, KeyError):
+                telegram_log.exception('getUpdates failed')
+                if once:
+                    raise click.ClickException('getUpdates failed')
+                failures += 1
+                time.sleep(min(2 ** failures, 60))
+                continue
+            
+            applied = apply_telegram_updates(conn, updates, offset_key)
+            if updates:
+                offset = updates[-1]['update_id'] + 1
+                skipped = len(updates) - applied
+                print(f"✅ Applied {applied} updates" + (f" (skipped {skipped} malformed)" if skipped else ''))
+            if once:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        conn.close()
+
+@app.cli.command('build-static')
+def build_static():
+    """Fingerprint static assets and write gzip/brotli variants to static/dist"""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        print("❌ brotli not installed - writing gzip variants only")
+    
+    dist_dir = os.path.join(app.static_folder, STATIC_DIST_DIR)
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    os.makedirs(dist_dir)
+    
+    manifest = {}
+    for name in sorted(os.listdir(app.static_folder)):
+        root, ext = os.path.splitext(name)
+        path = os.path.join(app.static_folder, name)
+        if ext not in STATIC_FINGERPRINT_EXTENSIONS or not os.path.isfile(path):
+            continue
+        
+        with open(path, 'rb') as f:
+            content = f.read()
+        hashed_name = f'{root}.{hashlib.sha256(content).hexdigest()[:10]}{ext}'
+        hashed_path = os.path.join(dist_dir, hashed_name)
+        
+        variants = {'': content, '.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli:
+            variants['.br'] = brotli.compress(content, quality=11)
+        for suffix, data in variants.items():
+            with open(hashed_path + suffix, 'wb') as f:
+                f.write(data)
+        
+        manifest[name] = f'{STATIC_DIST_DIR}/{hashed_name}'
+        sizes = ', '.join(f"{suffix or 'raw'} {len(data):,}B" for suffix, data in variants.items())
+        print(f"✅ {name} -> {manifest[name]} ({sizes})")
+    
+    with open(os.path.join(dist_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"✅ Wrote {len(manifest)} assets to static/{STATIC_DIST_DIR} - restart the app to pick them up")
+
 if __name__ == '__main__':
     print("🚀 Starting Crypto Airdrop Server...")
     print("📍 Access your airdrop at: http://localhost:5000")
@@ -981,6 +3607,8 @@ if __name__ == '__main__':
     
     print(f"✅ Token System: {TOKEN_CONFIG['token_symbol']} tokens ready for distribution")
     print(f"✅ Token Ratio: {TOKEN_CONFIG['points_to_tokens_ratio']} points = 1 token")
+    for slug, campaign in CAMPAIGNS.items():
+        print(f"🎯 Campaign {slug}: http://localhost:5000{campaign.url_prefix}/ ({campaign.db_path})")
     
     app.run(debug=True, host='0.0.0.0', port=5000)
 
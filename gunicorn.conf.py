@@ -0,0 +1,23 @@
+# Gunicorn settings, picked up automatically by `gunicorn app:app`.
+#
+# Every open dashboard or tasks page holds an /events stream for as long as
+# the tab is open. With the default sync worker each stream pins a whole
+# worker process, so a handful of visitors would stall the site. gthread
+# workers serve each connection on a thread from a pool instead; an idle
+# stream just blocks on its queue. Size GUNICORN_THREADS for the number of
+# concurrently open pages per worker plus headroom for ordinary requests.
+# Events reach streams in every worker through the shared EVENTS_DB file,
+# so any number of workers is fine.
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '100'))
+
+# The arbiter's timeout only watches the worker heartbeat, which gthread
+# keeps up while streams are open; it does not cut long responses short
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+# Open streams never finish on their own; don't hold a reload up waiting for them
+graceful_timeout = 10
@@ -0,0 +1,62 @@
+// Applies /events deltas to the /dashboard page instead of reloading it
+const base = document.body.dataset.base || '';
+// Ask for every event since the snapshot this page was rendered from
+const since = document.body.dataset.since;
+const source = new EventSource(base + '/events?topics=registration,task_completed,distribution' + (since ? '&since=' + since : ''));
+
+// The server could no longer replay everything since the snapshot: re-render once from a fresh one
+source.addEventListener('resync', function() {
+    const url = new URL(window.location.href);
+    if (url.searchParams.has('resync')) return;
+    source.close();
+    url.searchParams.set('resync', since || '0');
+    window.location.replace(url);
+});
+
+function bumpStat(id, delta) {
+    const el = document.getElementById(id);
+    el.textContent = (parseInt(el.textContent, 10) || 0) + delta;
+}
+
+function userPoints(wallet) {
+    return document.querySelector(`.user-card[data-wallet="${CSS.escape(wallet)}"] .points`);
+}
+
+function bumpUserPoints(wallet, delta) {
+    const el = userPoints(wallet);
+    if (el) el.textContent = (parseInt(el.textContent, 10) || 0) + delta;
+}
+
+source.addEventListener('registration', function(e) {
+    const user = JSON.parse(e.data);
+    bumpStat('userCount', 1);
+    if (user.twitter_handle) bumpStat('twitterConnected', 1);
+    if (user.referred_by) {
+        bumpStat('totalPoints', user.referrer_points);
+        bumpUserPoints(user.referred_by, user.referrer_points);
+    }
+
+    const card = document.createElement('div');
+    card.className = 'user-card';
+    card.dataset.wallet = user.wallet_address;
+    const twitterInfo = user.twitter_handle ? ` | Twitter: @${user.twitter_handle}` : '';
+    card.append(`${user.wallet_address}${twitterInfo} | Points: `);
+    const points = document.createElement('span');
+    points.className = 'points';
+    points.textContent = '0';
+    card.append(points, ` | Joined: ${user.registered_at}`);
+    document.getElementById('userList').prepend(card);
+});
+
+source.addEventListener('task_completed', function(e) {
+    const task = JSON.parse(e.data);
+    bumpStat('totalPoints', task.points_earned);
+    bumpUserPoints(task.wallet_address, task.points_earned);
+});
+
+source.addEventListener('distribution', function(e) {
+    const dist = JSON.parse(e.data);
+    bumpStat('totalPoints', -dist.points_reset);
+    const el = userPoints(dist.wallet_address);
+    if (el) el.textContent = '0';
+});
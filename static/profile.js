@@ -0,0 +1,20 @@
+// Campaign URL prefix ('' for the default campaign, '/c/<slug>' otherwise)
+const base = document.body.dataset.base || '';
+
+// For now, show basic profile info
+document.getElementById('referralCode').textContent = 'Join to get your code';
+document.getElementById('referralLink').textContent = window.location.origin + base + '/';
+
+function copyReferralCode() {
+    const code = document.getElementById('referralCode').textContent;
+    navigator.clipboard.writeText(code).then(() => {
+        alert('Referral code copied to clipboard!');
+    });
+}
+
+function copyReferralLink() {
+    const link = document.getElementById('referralLink').textContent;
+    navigator.clipboard.writeText(link).then(() => {
+        alert('Referral link copied to clipboard!');
+    });
+}
@@ -1,3 +1,6 @@
+// Campaign URL prefix ('' for the default campaign, '/c/<slug>' otherwise)
+const base = document.body.dataset.base || '';
+
 document.getElementById('airdropForm').addEventListener('submit', async function(e) {
     e.preventDefault();
     
@@ -30,7 +33,7 @@ document.getElementById('airdropForm').addEventListener('submit', async function
     try {
         showMessage('Submitting...', 'info');
         
-        const response = await fetch('/join-airdrop', {
+        const response = await fetch(base + '/join-airdrop', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -46,12 +49,13 @@ document.getElementById('airdropForm').addEventListener('submit', async function
         if (result.success) {
             showMessage(result.message, 'success');
             
-            // Store wallet address for tasks page
-            localStorage.setItem('walletAddress', walletAddress);
+            // Store the checksummed wallet address for tasks page
+            const registeredWallet = result.wallet_address || walletAddress;
+            localStorage.setItem('walletAddress', registeredWallet);
             
             // Redirect to tasks page after 2 seconds
             setTimeout(() => {
-                window.location.href = '/tasks?wallet=' + encodeURIComponent(walletAddress);
+                window.location.href = base + '/tasks?wallet=' + encodeURIComponent(registeredWallet);
             }, 2000);
             
             // Clear form
@@ -0,0 +1,285 @@
+// Campaign URL prefix ('' for the default campaign, '/c/<slug>' otherwise)
+const base = document.body.dataset.base || '';
+
+// Get wallet address from URL parameter or localStorage
+function getWalletAddress() {
+    const urlParams = new URLSearchParams(window.location.search);
+    return urlParams.get('wallet') || localStorage.getItem('walletAddress');
+}
+
+// Load tasks
+async function loadTasks() {
+    const walletAddress = getWalletAddress();
+    if (!walletAddress) {
+        alert('No wallet address found. Please join the airdrop first.');
+        window.location.href = base + '/';
+        return;
+    }
+
+    try {
+        const response = await fetch(`${base}/tasks/${walletAddress}`);
+        const data = await response.json();
+
+        if (data.error) {
+            alert('Error loading tasks: ' + data.error);
+            return;
+        }
+
+        // Update progress
+        const progress = data.progress;
+        document.getElementById('progressFill').style.width = `${progress.percentage}%`;
+        document.getElementById('progressText').innerHTML = `
+            ${progress.completed}/${progress.total} tasks completed • 
+            ${progress.points}/${progress.max_points} points earned
+        `;
+
+        // Render tasks
+        const tasksList = document.getElementById('tasksList');
+        tasksList.innerHTML = '';
+
+        for (const [taskId, task] of Object.entries(data.tasks)) {
+            const taskDesc = data.descriptions[taskId];
+            const isCompleted = task.completed;
+
+            const taskElement = document.createElement('div');
+            taskElement.className = `task-item ${isCompleted ? 'task-completed' : ''}`;
+
+            taskElement.innerHTML = `
+                <div class="task-info">
+                    <div class="task-name">${taskDesc.name}</div>
+                    <div class="task-points">${taskDesc.points} points</div>
+                </div>
+                <div class="task-status ${isCompleted ? 'status-completed' : 'status-pending'}">
+                    ${isCompleted ? '✅ Completed' : '⏳ Pending'}
+                </div>
+                ${!isCompleted && taskId !== 'follow_twitter' && taskId !== 'retweet' ? `
+                    <button class="complete-btn" onclick="completeTask('${taskId}')">
+                        Complete
+                    </button>
+                ` : ''}
+            `;
+
+            tasksList.appendChild(taskElement);
+        }
+    } catch (error) {
+        console.error('Error loading tasks:', error);
+        alert('Error loading tasks. Please try again.');
+    }
+}
+
+// Complete a task
+async function completeTask(taskName) {
+    const walletAddress = getWalletAddress();
+
+    try {
+        const response = await fetch(base + '/complete-task', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                wallet_address: walletAddress,
+                task_name: taskName
+            })
+        });
+
+        const result = await response.json();
+        if (result.success) {
+            alert('Task completed successfully!');
+            loadTasks();
+        } else {
+            alert('Error: ' + result.message);
+            if (result.telegram_link) {
+                window.open(result.telegram_link, '_blank');
+            }
+        }
+    } catch (error) {
+        console.error('Error completing task:', error);
+        alert('Error completing task');
+    }
+}
+
+// Verify Twitter follow
+async function verifyTwitterFollow() {
+    const walletAddress = getWalletAddress();
+    const twitterHandle = document.getElementById('twitterHandleVerify').value.trim().replace('@', '');
+
+    if (!twitterHandle) {
+        alert('Please enter your Twitter handle');
+        return;
+    }
+
+    const resultDiv = document.getElementById('twitterVerificationResult');
+    resultDiv.innerHTML = '<div style="color: #666;">🔄 Verifying Twitter follow...</div>';
+
+    try {
+        const response = await fetch(base + '/verify-twitter', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                wallet_address: walletAddress,
+                twitter_handle: twitterHandle
+            })
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            resultDiv.innerHTML = `<div class="success">${result.message}</div>`;
+
+            // Update Twitter stats if available
+            if (result.follower_count) {
+                document.getElementById('followerCount').textContent = result.follower_count.toLocaleString();
+                document.getElementById('verificationStatus').textContent = '✅';
+                document.getElementById('twitterStats').style.display = 'grid';
+            }
+
+            loadTasks();
+        } else {
+            resultDiv.innerHTML = `<div class="error">${result.message}</div>`;
+        }
+    } catch (error) {
+        console.error('Twitter verification error:', error);
+        resultDiv.innerHTML = '<div class="error">Twitter verification failed. Please try again.</div>';
+    }
+}
+
+// Verify retweet
+async function verifyRetweet() {
+    const walletAddress = getWalletAddress();
+    const twitterHandle = document.getElementById('twitterHandleVerify').value.trim().replace('@', '');
+    const tweetUrl = document.getElementById('tweetUrl').value.trim();
+
+    if (!twitterHandle) {
+        alert('Please enter your Twitter handle first');
+        return;
+    }
+
+    if (!tweetUrl) {
+        alert('Please enter the tweet URL');
+        return;
+    }
+
+    const resultDiv = document.getElementById('twitterVerificationResult');
+    resultDiv.innerHTML = '<div style="color: #666;">🔄 Verifying retweet...</div>';
+
+    try {
+        const response = await fetch(base + '/verify-retweet', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                wallet_address: walletAddress,
+                twitter_handle: twitterHandle,
+                tweet_url: tweetUrl
+            })
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            resultDiv.innerHTML = `<div class="success">${result.message}</div>`;
+            loadTasks();
+        } else {
+            resultDiv.innerHTML = `<div class="error">${result.message}</div>`;
+        }
+    } catch (error) {
+        console.error('Retweet verification error:', error);
+        resultDiv.innerHTML = '<div class="error">Retweet verification failed. Please try again.</div>';
+    }
+}
+
+// Check Twitter API status
+async function checkTwitterStatus() {
+    try {
+        const response = await fetch('/twitter-status');
+        const status = await response.json();
+
+        const statusDiv = document.getElementById('twitterApiStatus');
+
+        if (status.api_ready) {
+            statusDiv.innerHTML = `
+                <div class="api-status api-connected">
+                    ✅ Twitter API Connected - Real verification enabled
+                </div>
+                <div style="text-align: center; color: #666; margin-top: 10px;">
+                    Project: @${status.project_username} • API: Working
+                </div>
+            `;
+        } else if (status.twitter_configured) {
+            statusDiv.innerHTML = `
+                <div class="api-status api-simulated">
+                    ⚠️ Twitter API Configured but connection failed
+                </div>
+                <div style="text-align: center; color: #666; margin-top: 10px;">
+                    ${status.api_test_message || 'Check your API credentials'}
+                </div>
+            `;
+        } else {
+            statusDiv.innerHTML = `
+                <div class="api-status api-simulated">
+                    🐦 Simulation Mode - Using simulated Twitter verification
+                </div>
+                <div style="text-align: center; color: #666; margin-top: 10px;">
+                    Add Twitter API credentials for real verification
+                </div>
+            `;
+        }
+    } catch (error) {
+        console.error('Error checking Twitter status:', error);
+    }
+}
+
+// Auto-check Twitter status when page loads
+async function initializePage() {
+    await checkTwitterStatus();
+    await loadTasks();
+}
+
+// Load tasks and check status when page loads
+window.onload = initializePage;
+
+// Refresh tasks when this wallet completes a task elsewhere
+function subscribeToTaskEvents() {
+    const walletAddress = getWalletAddress();
+    if (!walletAddress) return;
+    const source = new EventSource(`${base}/events?topics=task_completed&wallet=${encodeURIComponent(walletAddress)}`);
+    source.addEventListener('task_completed', function() {
+        loadTasks();
+    });
+}
+
+subscribeToTaskEvents();
+
+// Add real-time validation for Twitter handle
+document.getElementById('twitterHandleVerify').addEventListener('input', function(e) {
+    const handle = e.target.value.trim().replace('@', '');
+    if (handle.length > 0) {
+        // Hide stats until new verification
+        document.getElementById('twitterStats').style.display = 'none';
+    }
+});
+
+// Add keyboard shortcuts
+document.addEventListener('keydown', function(e) {
+    if (e.ctrlKey || e.metaKey) {
+        switch(e.key) {
+            case 'r':
+                e.preventDefault();
+                loadTasks();
+                break;
+            case 't':
+                e.preventDefault();
+                checkTwitterStatus();
+                break;
+        }
+    }
+});
+
+// Show keyboard shortcuts info
+console.log('📋 Keyboard shortcuts:');
+console.log('Ctrl+R - Refresh tasks');
+console.log('Ctrl+T - Check Twitter status');
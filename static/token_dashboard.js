@@ -0,0 +1,63 @@
+// Apply live deltas from /events instead of re-running the dashboard queries
+const base = document.body.dataset.base || '';
+// Ask for every event since the snapshot this page was rendered from
+const since = document.body.dataset.since;
+const source = new EventSource(base + '/events?topics=registration,tokens_earned,distribution' + (since ? '&since=' + since : ''));
+
+// The server could no longer replay everything since the snapshot: re-render once from a fresh one
+source.addEventListener('resync', function() {
+    const url = new URL(window.location.href);
+    if (url.searchParams.has('resync')) return;
+    source.close();
+    url.searchParams.set('resync', since || '0');
+    window.location.replace(url);
+});
+const tokenSymbol = document.body.dataset.tokenSymbol;
+
+function bumpStat(id, delta) {
+    const el = document.getElementById(id);
+    const value = (parseInt(el.textContent.replace(/,/g, ''), 10) || 0) + delta;
+    el.textContent = value.toLocaleString('en-US');
+}
+
+function shortHash(value, head, tail) {
+    return `${value.slice(0, head)}...${value.slice(-tail)}`;
+}
+
+source.addEventListener('registration', function() {
+    bumpStat('totalUsers', 1);
+});
+
+source.addEventListener('tokens_earned', function(e) {
+    bumpStat('tokensEarned', JSON.parse(e.data).delta);
+});
+
+source.addEventListener('distribution', function(e) {
+    const dist = JSON.parse(e.data);
+    bumpStat('tokensDistributed', dist.tokens_distributed_delta);
+    if (dist.first_claim) bumpStat('claimsProcessed', 1);
+
+    const placeholder = document.getElementById('noDistributions');
+    if (placeholder) placeholder.remove();
+
+    const item = document.createElement('div');
+    item.className = 'distribution-item';
+    const wallet = document.createElement('div');
+    const strong = document.createElement('strong');
+    strong.textContent = shortHash(dist.wallet_address, 10, 8);
+    const amount = document.createElement('small');
+    amount.textContent = `${dist.tokens} ${tokenSymbol}`;
+    wallet.append(strong, document.createElement('br'), amount);
+    const txHash = document.createElement('div');
+    txHash.className = 'tx-hash';
+    txHash.textContent = shortHash(dist.tx_hash, 20, 10);
+    const date = document.createElement('div');
+    date.textContent = dist.distribution_date.slice(0, 16);
+    item.append(wallet, txHash, date);
+
+    const items = document.getElementById('distributionItems');
+    items.prepend(item);
+    while (items.querySelectorAll('.distribution-item').length > 10) {
+        items.lastElementChild.remove();
+    }
+});
@@ -0,0 +1,115 @@
+"""Benchmark /admin/search (FTS5 trigram) against the equivalent LIKE '%...%' scan.
+
+Seeds a scratch database with N users, then times the same substring queries
+through the route and as a plain LIKE over the four searched columns:
+
+    python tests/bench_admin_search.py --users 200000 --rounds 20
+"""
+import argparse
+import os
+import random
+import secrets
+import sqlite3
+import statistics
+import string
+import sys
+import tempfile
+import time
+
+LIKE_SQL = '''
+    SELECT id, wallet_address, twitter_handle, email, referral_code, points, registered_at
+    FROM users
+    WHERE wallet_address LIKE ?1 OR twitter_handle LIKE ?1 OR email LIKE ?1 OR referral_code LIKE ?1
+    ORDER BY id DESC
+    LIMIT ?2
+'''
+
+
+def random_word(rng, length):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+
+def seed(db_path, users, rng):
+    conn = sqlite3.connect(db_path)
+    rows = []
+    codes = set()
+    while len(rows) < users:
+        code = secrets.token_hex(4).upper()
+        if code in codes:
+            continue
+        codes.add(code)
+        handle = random_word(rng, rng.randint(6, 12))
+        rows.append(('0x' + secrets.token_hex(20), f'{handle}@{random_word(rng, 6)}.com', handle, code,
+                     rng.randint(0, 500)))
+    conn.executemany('''
+        INSERT INTO users (wallet_address, email, twitter_handle, referral_code, points) VALUES (?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    conn.close()
+    return rows
+
+
+def sample_queries(rows, rng, count):
+    """Substrings of stored values (hits) plus random strings (mostly misses)"""
+    queries = []
+    for _ in range(count):
+        wallet, email, handle, code, _ = rng.choice(rows)
+        value = rng.choice([wallet[2:], email, handle, code])
+        start = rng.randrange(0, max(len(value) - 5, 1))
+        queries.append(value[start:start + rng.randint(3, 6)])
+    queries += [random_word(rng, 5) for _ in range(count // 4)]
+    return queries
+
+
+def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=200000)
+    parser.add_argument('--queries', type=int, default=40, help='Distinct search strings')
+    parser.add_argument('--rounds', type=int, default=5, help='Timed runs per search string')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    workdir = tempfile.mkdtemp(prefix='bench-search-')
+    os.chdir(workdir)
+    os.environ['LOG_LEVEL'] = 'ERROR'
+    os.environ['ADMIN_API_TOKEN'] = token = 'bench-token'
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import app
+
+    app.init_db('airdrop.db')
+    started = time.time()
+    rows = seed('airdrop.db', args.users, rng)
+    print(f"🌱 Seeded {args.users:,} users in {time.time() - started:.1f}s ({workdir})")
+
+    client = app.app.test_client()
+    conn = sqlite3.connect('airdrop.db')
+    fts, like = [], []
+    for query in sample_queries(rows, rng, args.queries):
+        fts_hits = client.get('/admin/search', query_string={'q': query, 'limit': args.limit, 'token': token})
+        fts_ids = [r['id'] for r in fts_hits.get_json()['results']]
+        like_ids = [r[0] for r in conn.execute(LIKE_SQL, (f'%{query}%', args.limit))]
+        assert fts_ids == like_ids, f'Results differ for {query!r}'
+
+        fts += timed(lambda: client.get('/admin/search', query_string={
+            'q': query, 'limit': args.limit, 'token': token}), args.rounds)
+        like += timed(lambda: conn.execute(LIKE_SQL, (f'%{query}%', args.limit)).fetchall(), args.rounds)
+
+    for name, samples in (('FTS5 trigram (/admin/search)', fts), ("LIKE '%...%' (SQL only)", like)):
+        samples.sort()
+        print(f"{name:30} median {statistics.median(samples):7.2f} ms   "
+              f"p95 {samples[int(len(samples) * 0.95)]:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
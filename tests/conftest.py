@@ -0,0 +1,28 @@
+"""Shared fixtures for tests that drive the app in-process."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """The app imported in-process, with every SQLite file in a scratch directory"""
+    workdir = tmp_path_factory.mktemp('app')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    os.environ['LOG_LEVEL'] = 'ERROR'
+    try:
+        import app
+        yield app
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
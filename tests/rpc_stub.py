@@ -0,0 +1,112 @@
+"""Local stand-in for an Ethereum JSON-RPC node that answers eth_getBalance,
+eth_getTransactionCount and eth_blockNumber, batched or not.
+
+Batch replies come back shuffled (as real providers may return them), chosen
+wallets can be made to fail per call, and whole requests can be failed with
+an HTTP status to exercise retries. Run it directly to point the scanner at it:
+
+    python tests/rpc_stub.py --port 8545 --wallets wallets.txt
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class RpcStub:
+    def __init__(self, block_number=100, shuffle=True):
+        self.block_number = block_number
+        self.shuffle = shuffle
+        self.lock = threading.Lock()
+        self.accounts = {}  # wallet (lowercase) -> (balance_wei, tx_count)
+        self.failing_wallets = set()  # lowercase wallets whose calls return a JSON-RPC error
+        self.http_failures = []  # statuses returned, one per request, before serving normally
+        self.requests = 0
+        self.failed_requests = 0
+        self.queried = []  # wallet of every eth_getBalance call, in arrival order
+        self.server = None
+
+    def set_account(self, wallet, balance_wei=0, tx_count=0):
+        self.accounts[wallet.lower()] = (balance_wei, tx_count)
+
+    def answer(self, call):
+        method, params = call.get('method'), call.get('params') or []
+        if method == 'eth_blockNumber':
+            return {'result': hex(self.block_number)}
+        if method in ('eth_getBalance', 'eth_getTransactionCount'):
+            wallet = params[0].lower()
+            if method == 'eth_getBalance':
+                with self.lock:
+                    self.queried.append(wallet)
+            if wallet in self.failing_wallets:
+                return {'error': {'code': -32000, 'message': 'header not found'}}
+            balance, tx_count = self.accounts.get(wallet, (0, 0))
+            return {'result': hex(balance if method == 'eth_getBalance' else tx_count)}
+        return {'error': {'code': -32601, 'message': f'Method {method} not found'}}
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = json.loads(self.rfile.read(length))
+                with stub.lock:
+                    stub.requests += 1
+                    status = stub.http_failures.pop(0) if stub.http_failures else None
+                    if status:
+                        stub.failed_requests += 1
+                if status:
+                    return self.reply(status, {'error': 'stub failure'})
+
+                if isinstance(payload, list):
+                    replies = [{'jsonrpc': '2.0', 'id': call['id'], **stub.answer(call)} for call in payload]
+                    if stub.shuffle:
+                        random.shuffle(replies)
+                else:
+                    replies = {'jsonrpc': '2.0', 'id': payload['id'], **stub.answer(payload)}
+                self.reply(200, replies)
+
+            def reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def start(self, port=0):
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self.handler())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8545)
+    parser.add_argument('--block', type=int, default=100, help='Value returned by eth_blockNumber')
+    parser.add_argument('--wallets', type=argparse.FileType(), help='Funded wallets, one per line')
+    args = parser.parse_args()
+    stub = RpcStub(args.block)
+    for line in args.wallets or []:
+        if line.strip():
+            stub.set_account(line.strip(), balance_wei=10 ** 18, tx_count=1)
+    print(f"JSON-RPC stub listening on {stub.start(args.port)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stub.stop()
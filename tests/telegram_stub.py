@@ -0,0 +1,106 @@
+"""Local stand-in for the Telegram Bot API: getUpdates, setWebhook and deleteWebhook.
+
+Updates pushed into the stub are served by getUpdates with Telegram's offset
+semantics (asking for offset N confirms and drops every update below N).
+Run it directly to point the app at it (TELEGRAM_API_BASE=http://127.0.0.1:8091):
+
+    python tests/telegram_stub.py --port 8091
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METHOD_PATH = re.compile(r'^/bot([^/]+)/(\w+)$')
+
+
+class TelegramStub:
+    def __init__(self, token='123456:test-token'):
+        self.token = token
+        self.lock = threading.Lock()
+        self.updates = []
+        self.next_update_id = 1000
+        self.offsets = []  # offset of every getUpdates call, in order
+        self.webhook_url = None
+        self.server = None
+
+    def push(self, update):
+        """Queue an update (update_id is assigned) and return its id"""
+        with self.lock:
+            update = {'update_id': self.next_update_id, **update}
+            self.next_update_id += 1
+            self.updates.append(update)
+            return update['update_id']
+
+    def get_updates(self, params):
+        with self.lock:
+            offset = params.get('offset')
+            self.offsets.append(offset)
+            if offset is not None:
+                self.updates = [update for update in self.updates if update['update_id'] >= offset]
+            return list(self.updates[:params.get('limit', 100)])
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                match = METHOD_PATH.match(self.path.split('?')[0])
+                if not match or match.group(1) != stub.token:
+                    return self.reply(401, {'ok': False, 'error_code': 401, 'description': 'Unauthorized'})
+                length = int(self.headers.get('Content-Length') or 0)
+                params = json.loads(self.rfile.read(length) or b'{}')
+
+                method = match.group(2)
+                if method == 'getUpdates':
+                    if stub.webhook_url:
+                        return self.reply(409, {'ok': False, 'error_code': 409,
+                                                'description': 'Conflict: can\'t use getUpdates while webhook is active'})
+                    return self.reply(200, {'ok': True, 'result': stub.get_updates(params)})
+                if method == 'setWebhook':
+                    stub.webhook_url = params.get('url')
+                    return self.reply(200, {'ok': True, 'result': True})
+                if method == 'deleteWebhook':
+                    stub.webhook_url = None
+                    return self.reply(200, {'ok': True, 'result': True})
+                self.reply(404, {'ok': False, 'error_code': 404, 'description': 'Not Found'})
+
+            def reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def start(self, port=0):
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self.handler())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8091)
+    parser.add_argument('--token', default='123456:test-token', help='Bot token the stub accepts')
+    args = parser.parse_args()
+    stub = TelegramStub(args.token)
+    print(f"Telegram stub listening on {stub.start(args.port)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stub.stop()
@@ -0,0 +1,94 @@
+"""Telegram link codes, membership sync and webhook hardening against a local Bot API stub."""
+import sqlite3
+
+import pytest
+
+from telegram_stub import TelegramStub
+
+CHAT_ID = -1001234567890
+SECRET = 'webhook-secret'
+WALLET = '0x52908400098527886E0F7030069857D2E4169EE7'
+ALICE = {'id': 111, 'is_bot': False, 'first_name': 'Alice', 'username': 'alice'}
+
+
+@pytest.fixture
+def stub(app_module, monkeypatch):
+    stub = TelegramStub()
+    monkeypatch.setattr(app_module, 'TELEGRAM_API_BASE', stub.start())
+    monkeypatch.setattr(app_module, 'TELEGRAM_BOT_TOKEN', stub.token)
+    monkeypatch.setattr(app_module, 'TELEGRAM_CHAT_ID', str(CHAT_ID))
+    monkeypatch.setattr(app_module, 'TELEGRAM_WEBHOOK_SECRET', SECRET)
+    yield stub
+    stub.stop()
+
+
+def chat_member(user, status):
+    return {'chat_member': {
+        'chat': {'id': CHAT_ID, 'type': 'supergroup'},
+        'from': user,
+        'date': 0,
+        'old_chat_member': {'user': user, 'status': 'left'},
+        'new_chat_member': {'user': user, 'status': status}
+    }}
+
+
+def private_message(user, text):
+    return {'message': {'message_id': 1, 'date': 0, 'chat': {'id': user['id'], 'type': 'private'},
+                        'from': user, 'text': text}}
+
+
+def complete_telegram_task(client):
+    return client.post('/complete-task', json={'wallet_address': WALLET, 'task_name': 'join_telegram'}).get_json()
+
+
+def sync_once(app_module):
+    result = app_module.app.test_cli_runner().invoke(args=['telegram-sync', '--once'])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def test_link_join_leave_via_polling(app_module, client, stub):
+    assert client.post('/join-airdrop', json={'wallet_address': WALLET}).get_json()['success']
+
+    # Unlinked wallet gets a one-time code to send the bot
+    result = complete_telegram_task(client)
+    assert not result['success']
+    code = result['message'].split('/start ')[1].split()[0]
+
+    stub.push(private_message(ALICE, f'/start {code}'))
+    stub.push({'message': {'chat': {'type': 'supergroup'}}})  # malformed: no chat id, no sender
+    join_id = stub.push(chat_member(ALICE, 'member'))
+    output = sync_once(app_module)
+    assert 'Applied 2 updates (skipped 1 malformed)' in output
+
+    # The polling offset is stored with the batch and used on the next run
+    conn = sqlite3.connect(app_module.TELEGRAM_DB)
+    (offset,) = conn.execute("SELECT value FROM telegram_state WHERE key LIKE 'update_offset:%'").fetchone()
+    assert int(offset) == join_id + 1
+    assert complete_telegram_task(client)['success']
+
+    stub.push(chat_member(ALICE, 'left'))
+    sync_once(app_module)
+    assert stub.offsets[-1] == join_id + 1
+    with app_module.app.test_request_context('/'):
+        assert app_module.is_telegram_linked(WALLET)
+        assert not app_module.is_telegram_member(WALLET)
+
+
+def test_webhook_rejects_non_objects_and_skips_bad_updates(app_module, client, stub):
+    headers = {'X-Telegram-Bot-Api-Secret-Token': SECRET}
+    assert client.post('/telegram/webhook', json={}, headers={}).status_code == 401
+    assert client.post('/telegram/webhook', data='null', content_type='application/json',
+                       headers=headers).status_code == 400
+    assert client.post('/telegram/webhook', json=[1, 2], headers=headers).status_code == 400
+
+    # A malformed update is acknowledged (so Telegram stops redelivering it) and changes nothing
+    bob = {'id': 222, 'is_bot': False, 'first_name': 'Bob'}
+    bad = {'update_id': 1, 'chat_member': {'chat': {'id': CHAT_ID}, 'new_chat_member': {'user': bob}}}
+    assert client.post('/telegram/webhook', json=bad, headers=headers).status_code == 200
+    good = {'update_id': 2, **chat_member(bob, 'member')}
+    assert client.post('/telegram/webhook', json=good, headers=headers).get_json()['success']
+
+    conn = sqlite3.connect(app_module.TELEGRAM_DB)
+    rows = conn.execute('SELECT is_member FROM telegram_members WHERE telegram_user_id = ?', (bob['id'],)).fetchall()
+    assert rows == [(1,)]
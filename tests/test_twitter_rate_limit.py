@@ -0,0 +1,65 @@
+"""Many worker processes share one Twitter budget and never exceed the stub's limits."""
+import multiprocessing
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from twitter_stub import TwitterStub  # noqa: E402
+
+WORKERS = 8
+CALLS_PER_WORKER = 60  # 480 attempts against a 300-request window
+
+
+def hammer(start, results, calls):
+    """Worker process: import the app like a gunicorn worker and spend the shared budget"""
+    import app
+
+    counts = {'ok': 0, 'limited': 0, 'http_429': 0}
+    start.wait()
+    for i in range(calls):
+        try:
+            response = app.run_twitter_call_sync(
+                app.twitter_api_get('users_by_username', f'/2/users/by/username/user{i}'))
+            counts['ok' if response.status_code == 200 else 'http_429'] += 1
+        except app.TwitterRateLimited:
+            counts['limited'] += 1
+    results.put(counts)
+
+
+@pytest.fixture
+def stub():
+    stub = TwitterStub()
+    stub.url = stub.start()
+    yield stub
+    stub.stop()
+
+
+def test_workers_share_budget_without_429s(stub, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('TWITTER_API_BASE', stub.url)
+    monkeypatch.setenv('TWITTER_BEARER_TOKEN', 'test-token')
+    monkeypatch.setenv('TWITTER_RATE_LIMIT_DB', str(tmp_path / 'twitter_rate_limits.db'))
+    monkeypatch.setenv('TWITTER_RATE_LIMIT_MAX_WAIT', '0')
+    monkeypatch.setenv('LOG_LEVEL', 'ERROR')
+
+    ctx = multiprocessing.get_context('spawn')
+    start = ctx.Barrier(WORKERS)
+    results = ctx.Queue()
+    workers = [ctx.Process(target=hammer, args=(start, results, CALLS_PER_WORKER)) for _ in range(WORKERS)]
+    for worker in workers:
+        worker.start()
+    counts = [results.get(timeout=120) for _ in workers]
+    for worker in workers:
+        worker.join(timeout=30)
+
+    total = {key: sum(c[key] for c in counts) for key in counts[0]}
+    assert stub.rejected['users_by_username'] == 0
+    assert total['http_429'] == 0
+    assert total['ok'] == stub.served['users_by_username']
+    assert total['ok'] + total['limited'] == WORKERS * CALLS_PER_WORKER
+    # The shared bucket should hand out (nearly) the whole window, not starve workers
+    assert total['ok'] >= 0.9 * stub.limits['users_by_username']
@@ -0,0 +1,117 @@
+"""Local stand-in for the Twitter v2 API that enforces per-endpoint rate limits.
+
+Run it directly to point the app at it (TWITTER_API_BASE=http://127.0.0.1:8090):
+
+    python tests/twitter_stub.py --port 8090 --latency 0.2
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENDPOINTS = [
+    # (name, path pattern, requests per window)
+    ('users_by_username', re.compile(r'^/2/users/by/username/(\w+)$'), 300),
+    ('users_following', re.compile(r'^/2/users/(\d+)/following$'), 15),
+    ('users_tweets', re.compile(r'^/2/users/(\d+)/tweets$'), 1500)
+]
+
+
+class TwitterStub:
+    def __init__(self, window_seconds=900, latency=0.0, limits=None):
+        self.window_seconds = window_seconds
+        self.latency = latency
+        self.limits = {name: limit for name, _, limit in ENDPOINTS}
+        self.limits.update(limits or {})
+        self.lock = threading.Lock()
+        self.windows = {}  # endpoint -> [reset_at, remaining]
+        self.served = {name: 0 for name in self.limits}
+        self.rejected = {name: 0 for name in self.limits}
+        self.server = None
+
+    def take(self, endpoint):
+        """Admit one request; returns (admitted, limit, remaining, reset_at)"""
+        with self.lock:
+            now = time.time()
+            window = self.windows.get(endpoint)
+            if window is None or now >= window[0]:
+                window = self.windows[endpoint] = [int(now + self.window_seconds), self.limits[endpoint]]
+            admitted = window[1] > 0
+            if admitted:
+                window[1] -= 1
+                self.served[endpoint] += 1
+            else:
+                self.rejected[endpoint] += 1
+            return admitted, self.limits[endpoint], window[1], window[0]
+
+    def handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                for name, pattern, _ in ENDPOINTS:
+                    match = pattern.match(path)
+                    if match:
+                        break
+                else:
+                    return self.reply(404, {'errors': [{'message': 'Not found'}]})
+
+                if stub.latency:
+                    time.sleep(stub.latency)
+                admitted, limit, remaining, reset_at = stub.take(name)
+                headers = {
+                    'x-rate-limit-limit': str(limit),
+                    'x-rate-limit-remaining': str(remaining),
+                    'x-rate-limit-reset': str(reset_at)
+                }
+                if not admitted:
+                    return self.reply(429, {'title': 'Too Many Requests'}, headers)
+                if name == 'users_by_username':
+                    body = {'data': {'id': str(abs(hash(match.group(1))) % 10 ** 12), 'username': match.group(1),
+                                     'public_metrics': {'followers_count': 42}}}
+                else:
+                    body = {'data': []}
+                self.reply(200, body, headers)
+
+            def reply(self, status, body, headers=None):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def start(self, port=0):
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self.handler())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    args = parser.parse_args()
+    stub = TwitterStub(latency=args.latency)
+    print(f"Twitter stub listening on {stub.start(args.port)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stub.stop()